@@ -1,24 +1,221 @@
+import argparse
 import os
 from datetime import datetime
 
-from config import InputConfig
-from data import DataBuilder
-from excel import BudgetApp
+## Only light imports at module level, pandas/xlwings/openpyxl are loaded by
+## main() when (and if) a step needs them
+from constants import Defaults, Excel
 
+MIN_DATE = datetime(2025, 1, 1, 0, 0, 0)
+MAX_DATE = datetime(2030, 12, 31, 0, 0, 0)
 
-def main():
-    min_date = datetime(2025, 1, 1, 0, 0, 0)
-    max_date = datetime(2030, 12, 31, 0, 0, 0)
 
-    input_config = InputConfig()
-    input_config.prompt()
+def _parse_date(value: str) -> datetime:
+    """Parses a `--min-date`/`--max-date` argument (YYYY-MM-DD)"""
+    try:
+        return datetime.strptime(value, Defaults.DateFormats.NumberDate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date {value}, expected YYYY-MM-DD")
 
-    data_builder = DataBuilder(min_date=min_date, max_date=max_date)
+
+def parse_args(args: list = None) -> argparse.Namespace:
+    """Parses command line arguments
+
+    Parameters
+    ----------
+        args (list, optional): list, default None
+            arguments to parse, defaults to sys.argv
+
+    Returns
+    -------
+        argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="Builds the personal budget tool.")
+    parser.add_argument(
+        "--min-date",
+        type=_parse_date,
+        default=MIN_DATE,
+        help="start date of the budget, YYYY-MM-DD (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-date",
+        type=_parse_date,
+        default=MAX_DATE,
+        help="end date of the budget, YYYY-MM-DD (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--inputs",
+        default=Defaults.Paths.Inputs,
+        help="Inputs workbook (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--template",
+        default=Defaults.Paths.Template,
+        help="template workbook (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=Defaults.Paths.Output,
+        help="directory the budget is saved to (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=list(Excel.Backends.values()),
+        default=Excel.Backends.Xlwings,
+        help="workbook writer (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--summary-mode",
+        choices=list(Excel.SummaryMode.values()),
+        default=Excel.SummaryMode.Formulas,
+        help="how Summary totals are filled (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-prompt",
+        action="store_true",
+        help="build without opening Inputs for editing first",
+    )
+    parser.add_argument(
+        "--data-only",
+        action="store_true",
+        help="only build the budget detail & save it, skips the workbook",
+    )
+    parser.add_argument(
+        "--data-format",
+        choices=list(Defaults.DataFormats.values()),
+        default=Defaults.DataFormats.Csv,
+        help="file format of --data-only builds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--partition-by-year",
+        action="store_true",
+        help="save --data-only builds as a directory with one partition per year",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="cache parsed Inputs & Summary aggregates in this directory",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only recompute items changed since the last build, needs --cache-dir",
+    )
+    parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help="only generate the dates each item occurs on",
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="use memory-optimized dtypes"
+    )
+    parser.add_argument(
+        "--cash-balance",
+        type=float,
+        default=None,
+        metavar="OPENING_BALANCE",
+        help="add a daily running balance starting from this amount, on its own"
+        " sheet (or file with --data-only)",
+    )
+    parser.add_argument(
+        "--cash-balance-by",
+        default=None,
+        metavar="COLUMN",
+        help="keep a running balance per value of this column, ex. display_group,"
+        " needs --cash-balance 0 (each group starts at 0.00)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes to build the budget detail across (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print time, rows & memory of each build step at the end",
+    )
+    parsed = parser.parse_args(args)
+    if parsed.min_date > parsed.max_date:
+        parser.error("--min-date must be on or before --max-date")
+    if parsed.incremental and not parsed.cache_dir:
+        parser.error("--incremental requires --cache-dir to store builds in")
+    if parsed.cash_balance_by and parsed.cash_balance is None:
+        parser.error("--cash-balance-by requires --cash-balance")
+    if parsed.cash_balance_by and parsed.cash_balance:
+        parser.error(
+            "--cash-balance-by starts every group at 0.00, use --cash-balance 0"
+        )
+    return parsed
+
+
+def main(args: list = None):
+    args = parse_args(args)
+
+    if not args.no_prompt:
+        from config import InputConfig
+
+        input_config = InputConfig(inputs_path=os.path.abspath(args.inputs))
+        input_config.prompt()
+
+    from data import DataBuilder
+    from instrument import Instrumentation
+
+    instrumentation = Instrumentation(enabled=args.profile)
+    data_builder = DataBuilder(
+        min_date=args.min_date,
+        max_date=args.max_date,
+        sparse=args.sparse,
+        cache_dir=args.cache_dir,
+        incremental=args.incremental,
+        compact=args.compact,
+        inputs_path=args.inputs,
+        instrumentation=instrumentation,
+        workers=args.workers,
+    )
     data_builder.build_data_model()
     df = data_builder.get_df()
+    cash_balance = None
+    if args.cash_balance is not None:
+        cash_balance = data_builder.get_cash_balance(
+            args.cash_balance, args.cash_balance_by
+        )
+
+    if args.data_only:
+        file_name = f"Budget Tool {datetime.now().strftime('%Y%m%d')}"
+        data_path = os.path.join(args.output_dir, f"{file_name} Data")
+        if not args.partition_by_year:
+            data_path += f".{args.data_format}"
+        data_builder.export(data_path, args.data_format, args.partition_by_year)
+        if cash_balance is not None:
+            from utils import write_dataframe_output
+
+            write_dataframe_output(
+                cash_balance,
+                os.path.join(
+                    args.output_dir, f"{file_name} Cash Balance.{args.data_format}"
+                ),
+            )
+    else:
+        from excel import BudgetApp
+
+        excel_app = BudgetApp(
+            min_date=args.min_date,
+            max_date=args.max_date,
+            df=df,
+            backend=args.backend,
+            summary_mode=args.summary_mode,
+            template_path=args.template,
+            save_path=args.output_dir,
+            instrumentation=instrumentation,
+            cache_dir=args.cache_dir,
+            cash_balance=cash_balance,
+        )
+        excel_app.build()
+        excel_app.save_and_close()
 
-    excel_app = BudgetApp(min_date=min_date, max_date=max_date, df=df)
-    excel_app.save_and_close()
+    if args.profile:
+        instrumentation.print_summary()
 
 
 if __name__ == "__main__":
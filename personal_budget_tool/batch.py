@@ -0,0 +1,174 @@
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Tuple
+
+from constants import Models
+from data import DataBuilder
+
+
+def apply_scenario(
+    items: pd.DataFrame, seasonality: pd.DataFrame, scenario: dict
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Applies a scenario's overrides to the shared inputs
+
+    Scenario format:
+        {
+            "name": "10% raise",
+            "items": [
+                {
+                    "where": {"item_name": "Primary Income"},
+                    "scale": {"item_amount": 1.10},
+                },
+                {
+                    "where": {"item_name": "Rent"},
+                    "set": {"end_date": datetime(2026, 6, 30)},
+                },
+            ],
+            "seasonality": {12: 1.75},
+        }
+    Item overrides apply to every item matching all `where` fields (all items if
+    omitted): `set` replaces field values, `scale` multiplies them.
+    Seasonality maps month_number to its multiplier.
+
+    Parameters
+    ----------
+        items : pd.DataFrame
+            Columns: see `Models.BudgetItem`
+        seasonality : pd.DataFrame
+            Columns: see `Models.Seasonality`
+        scenario : dict
+
+    Returns
+    -------
+        Tuple[pd.DataFrame, pd.DataFrame]
+            items, seasonality with overrides applied (inputs are not modified)
+    """
+    items = items.copy()
+    for override in scenario.get("items", []):
+        mask = pd.Series(True, index=items.index)
+        for col, val in override.get("where", {}).items():
+            mask &= items[col] == val
+        for col, val in override.get("set", {}).items():
+            items.loc[mask, col] = val
+        for col, factor in override.get("scale", {}).items():
+            items.loc[mask, col] = items.loc[mask, col] * factor
+
+    seasonality = seasonality.copy()
+    for month_number, multiplier in scenario.get("seasonality", {}).items():
+        is_month = seasonality["month_number"] == month_number
+        if is_month.any():
+            seasonality.loc[is_month, "seasonality_multiplier"] = multiplier
+        else:
+            seasonality.loc[len(seasonality)] = [month_number, multiplier]
+    return items, seasonality
+
+
+def _build_scenario(
+    scenario: dict,
+    items: pd.DataFrame,
+    seasonality: pd.DataFrame,
+    min_date: datetime,
+    max_date: datetime,
+    output_dir: str,
+    builder_kwargs: dict,
+):
+    """Runs the DataBuilder pipeline for one scenario, in a worker process
+
+    Returns
+    -------
+        pd.DataFrame | str
+            budget detail, or the path it was written to if output_dir is set
+    """
+    items, seasonality = apply_scenario(items, seasonality, scenario)
+    data_builder = DataBuilder(
+        min_date=scenario.get("min_date", min_date),
+        max_date=scenario.get("max_date", max_date),
+        items=items,
+        seasonality=seasonality,
+        **builder_kwargs,
+    )
+    data_builder.build_data_model()
+    df = data_builder.get_df()
+    if output_dir is None:
+        return df
+
+    path = os.path.join(output_dir, f"{scenario['name']}.csv")
+    df.to_csv(path, index=False)
+    return path
+
+
+def build_scenarios(
+    scenarios: list,
+    min_date: datetime,
+    max_date: datetime,
+    max_workers: int = None,
+    output_dir: str = None,
+    cache_dir: str = None,
+    inputs_path: str = None,
+    **builder_kwargs,
+) -> dict:
+    """Builds the budget detail of many scenarios across a process pool
+
+    Budget Items & Seasonality are parsed from the Inputs file once, then each
+    scenario (see `apply_scenario()`) is built by its own DataBuilder in a
+    separate process.
+
+    Parameters
+    ----------
+        scenarios : list
+            scenario dicts, each with a unique "name". May override
+            "min_date"/"max_date"
+        min_date : datetime
+            Start date for the budget
+        max_date : datetime
+            End date for the budget
+        max_workers (int, optional): int, default None
+            Number of processes, defaults to the number of CPUs
+        output_dir (str, optional): str, default None
+            Write each scenario to `<output_dir>/<name>.csv` instead of returning
+            its dataframe (keeps results out of the parent process)
+        cache_dir (str, optional): str, default None
+            Cache for the parsed Inputs, see `read_dataframe_input()`
+        inputs_path (str, optional): str, default None
+            Inputs file to read from, defaults to `Defaults.Paths.Inputs`
+        **builder_kwargs :
+            passed to every DataBuilder (ex. sparse=True, compact=True)
+
+    Returns
+    -------
+        dict
+            scenario name -> pd.DataFrame (or csv path if output_dir is set)
+    """
+    names = [scenario["name"] for scenario in scenarios]
+    if len(set(names)) != len(names):
+        raise ValueError("Scenario names must be unique.")
+    if builder_kwargs.get("incremental"):
+        raise ValueError("Incremental builds are not supported for scenarios.")
+    if builder_kwargs.get("workers", 1) != 1:
+        raise ValueError("Scenarios already run in parallel, use max_workers.")
+
+    data_builder = DataBuilder(
+        min_date, max_date, cache_dir=cache_dir, inputs_path=inputs_path
+    )
+    items = data_builder.read_input(Models.BudgetItem)
+    seasonality = data_builder.read_input(Models.Seasonality)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            scenario["name"]: executor.submit(
+                _build_scenario,
+                scenario,
+                items,
+                seasonality,
+                min_date,
+                max_date,
+                output_dir,
+                builder_kwargs,
+            )
+            for scenario in scenarios
+        }
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,493 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from constants import Defaults, Excel
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+FREQUENCY_MIX = {
+    "Monthly": 0.4,
+    "Bi-Weekly": 0.15,
+    "Weekly": 0.12,
+    "Daily": 0.05,
+    "Every N Days": 0.04,
+    "Every N Weeks": 0.04,
+    "Every N Months": 0.05,
+    "Annual": 0.1,
+    "One-Time": 0.05,
+}
+## frequency_type -> range of frequency_day (N) for Every N items
+EVERY_N_RANGES = {
+    "Every N Days": (2, 31),
+    "Every N Weeks": (2, 7),
+    "Every N Months": (2, 7),
+}
+DISPLAY_GROUPS = [
+    "Home & Utilities",
+    "Auto & Transport",
+    "Food & Dining",
+    "Health & Personal",
+    "Entertainment & Memberships",
+    "Misc.",
+]
+BUILD_STAGES = [
+    "_get_dates",
+    "_get_calendar_index",
+    "_get_items",
+    "_get_date_items",
+    "_audit_date_frequencies",
+    "_calc_budget_amounts",
+    "get_df",
+]
+## Steps of _build_date_items, timed as one stage when the build is parallel
+DATE_ITEMS_STAGES = [
+    "_get_date_items",
+    "_audit_date_frequencies",
+    "_calc_budget_amounts",
+]
+## _get_summary_tables aggregates the detail, the getters after it read its
+## memoized tables & are recorded as `(cached)`
+SUMMARY_STAGES = [
+    "_get_summary_tables",
+    "_get_unique_months",
+    "_get_items",
+    "_get_category_groups",
+    "_get_item_totals",
+]
+
+
+def time_command(args: list, repeat: int = 5) -> float:
+    """Best wall time of a python command, in a fresh interpreter each run
+
+    Parameters
+    ----------
+        args : list
+            arguments to the python interpreter
+        repeat (int, optional): int, default 5
+            number of runs, the fastest is kept (least noise)
+
+    Returns
+    -------
+        float
+            seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark_startup(repeat: int = 5, cache_dir: str = None) -> dict:
+    """Times interpreter startup against `app.py` startup & a data-only build
+
+    Parameters
+    ----------
+        repeat (int, optional): int, default 5
+            runs per command, see `time_command()`
+        cache_dir (str, optional): str, default None
+            passed to the data-only build as --cache-dir, which is filled by an
+            untimed run first so every timed run reads the parsed Inputs cache
+
+    Returns
+    -------
+        dict
+            label -> seconds
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        data_only = [APP_PATH, "--no-prompt", "--data-only", "--output-dir", output_dir]
+        label = "app.py --data-only"
+        if cache_dir:
+            data_only += ["--cache-dir", cache_dir]
+            label += " (cached inputs)"
+            time_command(data_only, repeat=1)
+        return {
+            "bare interpreter": time_command(["-c", "pass"], repeat),
+            "app.py --help": time_command([APP_PATH, "--help"], repeat),
+            label: time_command(data_only, repeat),
+        }
+
+
+def generate_items(
+    n_items: int,
+    min_date: datetime,
+    max_date: datetime,
+    frequency_mix: dict = None,
+    seed: int = 0,
+):
+    """Generates a synthetic Budget Items table
+
+    Same columns & dtypes as the parsed Inputs sheet (see `Models.BudgetItem`),
+    with random amounts, groups & frequency fields that are valid for each
+    frequency_type.
+
+    Parameters
+    ----------
+        n_items : int
+            Number of items
+        min_date : datetime
+            Start date of the budget, Bi-Weekly & Every N items start before it
+        max_date : datetime
+            End date of the budget, Annual & One-Time dates fall before it
+        frequency_mix (dict, optional): dict, default FREQUENCY_MIX
+            frequency_type -> share of items
+        seed (int, optional): int, default 0
+            random seed, same seed gives the same table
+
+    Returns
+    -------
+        pd.DataFrame
+    """
+    import numpy as np
+    import pandas as pd
+
+    from constants import Models
+
+    frequency_mix = frequency_mix or FREQUENCY_MIX
+    rng = np.random.default_rng(seed)
+    frequency_type = rng.choice(
+        list(frequency_mix),
+        size=n_items,
+        p=np.array(list(frequency_mix.values())) / sum(frequency_mix.values()),
+    )
+    is_income = rng.random(n_items) < 0.1
+    horizon_days = (max_date - min_date).days
+    frequency_date = pd.Series(
+        pd.Timestamp(min_date)
+        + pd.to_timedelta(rng.integers(0, horizon_days + 1, n_items), unit="D")
+    ).dt.strftime(Defaults.DateFormats.NumberDate)
+    start_date = pd.Series(
+        pd.Timestamp(min_date)
+        - pd.to_timedelta(rng.integers(0, 365, n_items), unit="D")
+    )
+    frequency_day = np.select(
+        [
+            frequency_type == "Weekly",
+            frequency_type == "Monthly",
+            *[frequency_type == x for x in EVERY_N_RANGES],
+        ],
+        [
+            rng.integers(1, 8, n_items),
+            rng.integers(1, 32, n_items),
+            *[rng.integers(*bounds, n_items) for bounds in EVERY_N_RANGES.values()],
+        ],
+        np.nan,
+    )
+    is_dated = np.isin(frequency_type, ["Annual", "One-Time"])
+    item_ids = np.arange(1, n_items + 1)
+
+    items = pd.DataFrame(
+        {
+            Models.BudgetItem.IndexColumn: item_ids,
+            "is_active": rng.random(n_items) < 0.95,
+            "is_seasonality": rng.random(n_items) < 0.2,
+            "company_name": [f"Company {i % 50}" for i in item_ids],
+            "item_name": [f"Item {i}" for i in item_ids],
+            "category_name": [f"Category {i % 20}" for i in item_ids],
+            "category_group": [f"Category Group {i % 10}" for i in item_ids],
+            "display_group": np.where(
+                is_income, "Income", rng.choice(DISPLAY_GROUPS, n_items)
+            ),
+            "item_type": np.where(is_income, "Income", "Expense"),
+            "item_amount": rng.integers(1, 500, n_items) * 10.0,
+            "frequency_type": frequency_type,
+            "frequency_day": frequency_day,
+            "frequency_date": frequency_date.where(is_dated, np.nan),
+            "start_date": start_date.where(
+                np.isin(frequency_type, ["Bi-Weekly", *EVERY_N_RANGES])
+            ),
+            "end_date": pd.Series(pd.NaT, index=range(n_items), dtype=start_date.dtype),
+            "notes": np.nan,
+        }
+    )
+    return items
+
+
+def _time(func, *args):
+    """Runs func, returning (result, wall seconds, None)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start, None
+
+
+def _record(seconds: dict, peak_bytes: dict, stage: str, elapsed: float, peak):
+    """Keeps the fastest time of a stage, or its peak memory if measured"""
+    if peak is not None:
+        peak_bytes[stage] = peak
+    else:
+        seconds[stage] = min(elapsed, seconds.get(stage, elapsed))
+
+
+def _measure(func, *args):
+    """Runs func, returning (result, wall seconds, peak traced bytes)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def benchmark_build(
+    n_items: int,
+    years: int,
+    frequency_mix: dict = None,
+    repeat: int = 3,
+    template_path: str = None,
+    **builder_kwargs,
+) -> dict:
+    """Times each stage of a DataBuilder build & the Summary aggregation
+
+    Each stage is called in pipeline order on a synthetic budget (see
+    `generate_items()`), the fastest of `repeat` runs is kept per stage.
+    Memory is the peak allocated during the stage (tracemalloc), measured on
+    a separate run so tracing does not skew timings.
+
+    Parameters
+    ----------
+        n_items : int
+            Number of synthetic items
+        years : int
+            Length of the budget horizon
+        frequency_mix (dict, optional): dict, default FREQUENCY_MIX
+            see `generate_items()`
+        repeat (int, optional): int, default 3
+            timed runs per stage
+        template_path (str, optional): str, default None
+            If set, also time `BudgetApp.build()` on this template (openpyxl)
+        **builder_kwargs :
+            passed to DataBuilder (ex. sparse=True, compact=True)
+
+    Returns
+    -------
+        dict
+            case parameters, rows built, stage -> seconds & stage -> peak bytes
+    """
+    from data import DataBuilder
+    from excel import BudgetApp
+
+    min_date = datetime(2025, 1, 1)
+    max_date = min_date + timedelta(days=round(365.25 * years) - 1)
+    items = generate_items(n_items, min_date, max_date, frequency_mix)
+
+    seconds = {}
+    peak_bytes = {}
+    for run in range(repeat + 1):
+        measure = _measure if run == repeat else _time
+        data_builder = DataBuilder(min_date, max_date, items=items, **builder_kwargs)
+        build_stages = BUILD_STAGES
+        if data_builder.workers > 1:
+            build_stages = [x for x in BUILD_STAGES if x not in DATE_ITEMS_STAGES]
+            build_stages.insert(-1, "_build_date_items")
+        stages = [(stage, getattr(data_builder, stage)) for stage in build_stages]
+        df = None
+        for stage, func in stages:
+            df, elapsed, peak = measure(func)
+            _record(seconds, peak_bytes, stage, elapsed, peak)
+
+        budget_app = BudgetApp(min_date, max_date, df, backend=Excel.Backends.Openpyxl)
+        month_years = None
+        for stage in SUMMARY_STAGES:
+            args = (month_years,) if stage == "_get_item_totals" else ()
+            result, elapsed, peak = measure(getattr(budget_app, stage), *args)
+            label = f"summary.{stage}"
+            if stage != "_get_summary_tables":
+                label += " (cached)"
+            _record(seconds, peak_bytes, label, elapsed, peak)
+            if stage == "_get_unique_months":
+                month_years = result
+
+        if template_path:
+            budget_app = BudgetApp(
+                min_date,
+                max_date,
+                df,
+                backend=Excel.Backends.Openpyxl,
+                template_path=template_path,
+            )
+            _, elapsed, peak = measure(budget_app.build)
+            budget_app.writer.close()
+            _record(seconds, peak_bytes, "BudgetApp.build", elapsed, peak)
+
+    return {
+        "n_items": n_items,
+        "years": years,
+        "frequency_mix": frequency_mix or FREQUENCY_MIX,
+        "builder_kwargs": builder_kwargs,
+        "rows": len(df),
+        "seconds": seconds,
+        "total_seconds": sum(seconds.values()),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def run_suite(
+    n_items: list,
+    years: list,
+    output_path: str = None,
+    repeat: int = 3,
+    **kwargs,
+) -> dict:
+    """Runs `benchmark_build()` over every item count x horizon
+
+    Parameters
+    ----------
+        n_items : list
+            item counts
+        years : list
+            horizon lengths
+        output_path (str, optional): str, default None
+            Write results as json, to compare between versions (see
+            `compare_results()`)
+        repeat (int, optional): int, default 3
+            see `benchmark_build()`
+        **kwargs :
+            passed to `benchmark_build()`
+
+    Returns
+    -------
+        dict
+            environment info & results of each case
+    """
+    import pandas as pd
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cases": [
+            benchmark_build(items, horizon, repeat=repeat, **kwargs)
+            for items in n_items
+            for horizon in years
+        ],
+    }
+    if output_path:
+        with open(output_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+def compare_results(baseline: dict, results: dict, threshold: float = 1.2) -> list:
+    """Lists stages that got slower than baseline, see `run_suite()`
+
+    Cases are matched on item count, horizon, frequency mix & builder options.
+
+    Parameters
+    ----------
+        baseline : dict
+        results : dict
+        threshold (float, optional): float, default 1.2
+            ratio of current / baseline seconds that counts as a regression
+
+    Returns
+    -------
+        list
+            (n_items, years, stage, baseline_seconds, seconds) of regressions
+    """
+
+    def case_key(case: dict) -> str:
+        return json.dumps(
+            [
+                case["n_items"],
+                case["years"],
+                case["frequency_mix"],
+                case["builder_kwargs"],
+            ],
+            sort_keys=True,
+        )
+
+    baseline_cases = {case_key(case): case for case in baseline["cases"]}
+    regressions = []
+    for case in results["cases"]:
+        base = baseline_cases.get(case_key(case))
+        if base is None:
+            continue
+        for stage, seconds in case["seconds"].items():
+            base_seconds = base["seconds"].get(stage)
+            if base_seconds and seconds / base_seconds > threshold:
+                regressions.append(
+                    (case["n_items"], case["years"], stage, base_seconds, seconds)
+                )
+    return regressions
+
+
+def print_results(results: dict):
+    """Prints a table of stage timings & peak memory, see `run_suite()`"""
+    for case in results["cases"]:
+        print(
+            f"\n{case['n_items']} items x {case['years']} years"
+            f" ({case['rows']} rows, {case['builder_kwargs'] or 'default'})"
+        )
+        width = max(len(stage) for stage in case["seconds"])
+        for stage, seconds in case["seconds"].items():
+            peak = case["peak_bytes"].get(stage, 0) / 2**20
+            print(f"  {stage:<{width}}  {seconds * 1000:>9.1f} ms  {peak:>8.1f} MB")
+
+
+def print_timings(timings: dict):
+    """Prints a table of timings, see `benchmark_startup()`"""
+    width = max(len(label) for label in timings)
+    for label, seconds in timings.items():
+        print(f"{label:<{width}}  {seconds * 1000:>9.1f} ms")
+
+
+def main(args: list = None):
+    parser = argparse.ArgumentParser(description="Benchmarks the budget builder.")
+    parser.add_argument(
+        "--startup", action="store_true", help="only time app.py startup"
+    )
+    parser.add_argument("--items", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--years", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sparse", action="store_true")
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--cache-dir",
+        help="with --startup, time a data-only build reading cached inputs",
+    )
+    parser.add_argument("--template", help="also time BudgetApp.build (openpyxl)")
+    parser.add_argument("--output", help="write results to this json file")
+    parser.add_argument("--baseline", help="json results to check for regressions")
+    args = parser.parse_args(args)
+
+    if args.startup:
+        print_timings(benchmark_startup(args.repeat, args.cache_dir))
+        return
+
+    results = run_suite(
+        args.items,
+        args.years,
+        output_path=args.output,
+        repeat=args.repeat,
+        template_path=args.template,
+        sparse=args.sparse,
+        compact=args.compact,
+        workers=args.workers,
+    )
+    print_results(results)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(json.load(f), results)
+        for n_items, years, stage, base_seconds, seconds in regressions:
+            print(
+                f"Regression: {n_items} items x {years} years, {stage}"
+                f" {base_seconds * 1000:.1f} ms -> {seconds * 1000:.1f} ms"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
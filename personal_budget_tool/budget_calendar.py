@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Callable
+
+from constants import Models
+
+
+def generate_calendar(
+    min_date: datetime, max_date: datetime, seasonality: pd.DataFrame
+) -> pd.DataFrame:
+    """Generates the budget calendar between two dates (inclusive)
+
+    Vectorized equivalent of the formulas on the old Inputs `Dates` sheet,
+    seasonality_multiplier is the only column joined in (1.00 if the month
+    is missing from seasonality).
+
+    Parameters
+    ----------
+        min_date : datetime
+        max_date : datetime
+        seasonality : pd.DataFrame
+            Columns: see `Models.Seasonality`
+
+    Returns
+    -------
+        pd.DataFrame
+            Columns: see `Models.BudgetDate`
+    """
+    date = pd.Series(pd.date_range(min_date, max_date, freq="D", normalize=True))
+    weekday = date.dt.dayofweek
+    day_of_year = date.dt.dayofyear
+    day_of_week = (weekday + 1) % 7 + 1
+    jan_first_day_of_week = ((weekday - (day_of_year - 1)) % 7 + 1) % 7 + 1
+    week_number = (day_of_year - 1 + jan_first_day_of_week - 1) // 7 + 1
+    month_number = date.dt.month
+    year = date.dt.year
+    multipliers = seasonality.set_index("month_number")["seasonality_multiplier"]
+
+    dates = pd.DataFrame(
+        {
+            Models.BudgetDate.IndexColumn: range(1, len(date) + 1),
+            "date": date,
+            "day_of_week": day_of_week,
+            "day_number": date.dt.day,
+            "week_number": week_number,
+            "week_year": year * 100 + week_number,
+            "month_number": month_number,
+            "month_year": year * 100 + month_number,
+            "year": year,
+            "seasonality_multiplier": month_number.map(multipliers).fillna(1.00),
+        }
+    )
+    return dates.astype({col: "int64" for col in dates.columns[2:-1]})
+
+
+class CalendarIndex:
+    """Hash-based lookups over the budget calendar
+
+    Built once from the dates table (see `generate_calendar()`), so that
+    per-record date checks do not need to scan the calendar.
+
+    Attributes
+    ----------
+        last_days : dict
+            (year, month_number) -> number of days in the month, also for
+            months cut short by min_date/max_date
+    """
+
+    def __init__(self, dates: pd.DataFrame):
+        """Initializes CalendarIndex
+
+        Parameters
+        ----------
+            dates : pd.DataFrame
+                Columns: see `Models.BudgetDate`
+        """
+        months = dates[["year", "month_number"]].astype(int)
+        self.last_days = (
+            months.assign(last_day=dates["date"].dt.days_in_month)
+            .drop_duplicates(["year", "month_number"])
+            .set_index(["year", "month_number"])["last_day"]
+            .to_dict()
+        )
+
+
+class ScheduleCache:
+    """Occurrence dates of item schedules, computed once & shared between builds
+
+    Keyed on the fingerprint of an item's schedule fields (see
+    `data.SCHEDULE_COLUMNS`) & the calendar span, so items with the
+    same schedule share an entry and a cache can be passed to several
+    DataBuilders (ex. incremental rebuilds, scenarios) without going stale.
+
+    Attributes
+    ----------
+        schedules : dict
+            (fingerprint, min_date, max_date) -> np.ndarray of date_id
+
+    Methods
+    -------
+        get(key, compute):
+            Cached date_ids for key, computed on first use
+    """
+
+    def __init__(self):
+        """Initializes an empty ScheduleCache"""
+        self.schedules = {}
+
+    def get(self, key: tuple, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Get the date_ids a schedule occurs on
+
+        Parameters
+        ----------
+            key : tuple
+                (fingerprint, min_date, max_date)
+            compute : Callable[[], np.ndarray]
+                Returns the date_ids, only called if key is not cached
+
+        Returns
+        -------
+            np.ndarray
+                date_id of each occurrence
+        """
+        date_ids = self.schedules.get(key)
+        if date_ids is None:
+            date_ids = self.schedules[key] = compute()
+        return date_ids
@@ -1,23 +1,32 @@
 import os
 import time
-import xlwings as xw
 
-INPUTS_PATH = "../src/Inputs.xlsx"
+from constants import Defaults
+
+INPUTS_PATH = Defaults.Paths.Inputs
 
 
 class InputConfig:
-    def __init__(self):
-        """Initializes class"""
+    def __init__(self, inputs_path: str = INPUTS_PATH):
+        """Initializes class
+
+        Parameters
+        ----------
+            inputs_path (str, optional): str, default INPUTS_PATH
+                Inputs file to open for editing, see `prompt()`
+        """
         self.wb = None
-        self.prompt()
+        self.inputs_path = inputs_path
 
     def _connectToWb(self):
         """Creates instance of workbook for Inputs"""
-        self.wb = xw.Book(INPUTS_PATH)
+        import xlwings as xw
+
+        self.wb = xw.Book(self.inputs_path)
 
     def prompt(self):
         """Open Excel & Prompt to continue"""
-        print("Opening Inputs.xlsx..\n")
+        print(f"Opening {os.path.basename(self.inputs_path)}..\n")
 
         self._connectToWb()
         print("Press enter when done editing..")
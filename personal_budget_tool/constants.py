@@ -1,19 +1,32 @@
-from utils import DotDict
+import os
+
+
+class DotDict(dict):
+    __getattr__ = dict.get
+    __setattr__ = dict.__setitem__
+    __delattr__ = dict.__delitem__
+
+
+## Resolved from this file, so the tool runs from any working directory
+SRC_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "src"))
 
 
 class Defaults:
     DateFormats = DotDict({"NumberDate": "%Y-%m-%d", "MonthYear": "%m/%Y"})
+    ## Budget detail export formats, also the file extensions
+    DataFormats = DotDict({"Csv": "csv", "Parquet": "parquet", "Arrow": "arrow"})
+    Paths = DotDict(
+        {
+            "Inputs": os.path.join(SRC_DIR, "Inputs.xlsx"),
+            "Template": os.path.join(SRC_DIR, "Template.xlsx"),
+            "Output": os.path.join(SRC_DIR, "output"),
+        }
+    )
 
 
 class Models:
     BudgetDate = DotDict(
         {
-            "Source": {
-                "io": "../src/Inputs.xlsx",
-                "sheet_name": "Dates",
-                "header": 1,
-                "usecols": "B:J",
-            },
             "Columns": [
                 "date",
                 "day_of_week",
@@ -29,10 +42,22 @@ class Models:
         }
     )
 
+    Seasonality = DotDict(
+        {
+            "Source": {
+                "io": Defaults.Paths.Inputs,
+                "sheet_name": "Seasonality",
+                "header": 1,
+                "usecols": "B:C",
+            },
+            "Columns": ["month_number", "seasonality_multiplier"],
+        }
+    )
+
     BudgetItem = DotDict(
         {
             "Source": {
-                "io": "../src/Inputs.xlsx",
+                "io": Defaults.Paths.Inputs,
                 "sheet_name": "Budget Items",
                 "header": 1,
                 "usecols": "B:P",
@@ -87,6 +112,40 @@ class Models:
         }
     )
 
+    ## Memory-optimized dtypes & unused columns, see `DataBuilder._compact()`
+    Compact = DotDict(
+        {
+            "BudgetDate": {
+                "Dtypes": {
+                    "date_id": "int32",
+                    "day_of_week": "int8",
+                    "day_number": "int8",
+                    "week_number": "int8",
+                    "week_year": "int32",
+                    "month_number": "int8",
+                    "month_year": "int32",
+                    "year": "int16",
+                },
+            },
+            "BudgetItem": {
+                "Dtypes": {
+                    "budget_item_id": "int32",
+                    "is_active": "bool",
+                    "is_seasonality": "bool",
+                    "company_name": "category",
+                    "item_name": "category",
+                    "category_name": "category",
+                    "category_group": "category",
+                    "display_group": "category",
+                    "item_type": "category",
+                    "frequency_type": "category",
+                    "frequency_date": "category",
+                },
+                "Drop": ["notes"],
+            },
+        }
+    )
+
 
 class Excel:
     BordersIndex = DotDict(
@@ -118,6 +177,11 @@ class Excel:
             ],
         }
     )
+    Backends = DotDict({"Xlwings": "xlwings", "Openpyxl": "openpyxl"})
+    SummaryMode = DotDict(
+        {"Formulas": "formulas", "Bounded": "bounded", "Values": "values"}
+    )
+    DataOverflow = DotDict({"Sheets": "sheets", "File": "file"})
     # IncomeCategoryGroups = DotDict(["Income", "Taxes", "Benefits"])
     FormatType = DotDict(
         {
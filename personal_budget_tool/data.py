@@ -1,14 +1,40 @@
 import os
+import numpy as np
 import pandas as pd
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Union, Tuple
+from typing import Union
 
+import kernels
+from budget_calendar import CalendarIndex, ScheduleCache, generate_calendar
 from constants import Models
-from utils import read_dataframe_input, filter_df_between
+from instrument import Instrumentation, NO_INSTRUMENTATION
+from utils import read_dataframe_input, get_df_hash, write_dataframe_output
 
 warnings.simplefilter("ignore")
 
+## Fields an item's occurrence dates depend on, see `ScheduleCache`
+SCHEDULE_COLUMNS = ["frequency_type", "frequency_day", "frequency_date", "start_date"]
+
+## Frequencies stepped from start_date, frequency_type -> (unit, stride)
+## "Every N" strides are multiplied by frequency_day (N)
+STRIDE_FREQUENCIES = {
+    "Bi-Weekly": ("days", 14),
+    "Every N Days": ("days", 1),
+    "Every N Weeks": ("days", 7),
+    "Every N Months": ("months", 1),
+}
+EVERY_N_FREQUENCIES = ["Every N Days", "Every N Weeks", "Every N Months"]
+
+## Item shards per worker in parallel builds, smaller shards balance the load
+## (a Daily item has far more rows than an Annual one)
+SHARDS_PER_WORKER = 4
+
+## Version of the frequency rules, part of the key of stored incremental builds
+## (see `DataBuilder._get_build_key()`). Bump when the rows an item gives change
+BUILD_VERSION = 2
+
 
 class DataBuilder:
     """Class to interact with data model for budget
@@ -19,6 +45,26 @@ class DataBuilder:
             Start date for the budget
         max_date: datetime
             End date for the budget
+        sparse : bool
+            Only keep the dates on which each item occurs (see `_get_date_items()`)
+        cache_dir : str
+            Directory for parsed Inputs cache, see `read_dataframe_input()`
+        incremental : bool
+            Re-use results of the previous build for unchanged items
+        compact : bool
+            Use memory-optimized dtypes for dates, items & date_items
+        inputs_path : str
+            Inputs file the tables are read from
+        source_items : pd.DataFrame
+            Pre-parsed Budget Items, read from Inputs file if None
+        source_seasonality : pd.DataFrame
+            Pre-parsed month multipliers, read from Inputs file if None
+        instrumentation : Instrumentation
+            Measures each step of `build_data_model()`, see `instrument.py`
+        schedule_cache : ScheduleCache
+            Occurrence dates of stepped items, see `_get_schedules()`
+        workers : int
+            Processes date_items are built across, see `_build_date_items_parallel()`
 
     Methods
     -------
@@ -26,10 +72,30 @@ class DataBuilder:
             Acquires data from multiple sources, consolidates
         get_df():
             Returns df filtered for model
+        read_input(model):
+            Reads a table of the Inputs file
+        export(path, data_format, partition_by_year):
+            Writes data model to CSV, Parquet or Arrow IPC
+        get_cash_balance(opening_balance, by):
+            Returns daily running balance
 
     """
 
-    def __init__(self, min_date: datetime, max_date: datetime):
+    def __init__(
+        self,
+        min_date: datetime,
+        max_date: datetime,
+        sparse: bool = False,
+        cache_dir: str = None,
+        incremental: bool = False,
+        compact: bool = False,
+        items: pd.DataFrame = None,
+        seasonality: pd.DataFrame = None,
+        inputs_path: str = None,
+        instrumentation: Instrumentation = None,
+        schedule_cache: ScheduleCache = None,
+        workers: int = 1,
+    ):
         """Initializes DataBuilder class
 
         Parameters
@@ -38,344 +104,790 @@ class DataBuilder:
                 Start date for the budget
             max_date: datetime
                 End date for the budget
+            sparse (bool, optional): bool, default False
+                Generate only the dates each item occurs on, rather than every
+                date for every item. Records that do not occur are dropped.
+            cache_dir (str, optional): str, default None
+                Cache parsed Inputs tables in this directory, skipping Excel
+                parsing on later runs while Inputs.xlsx is unchanged
+            incremental (bool, optional): bool, default False
+                Store each build in cache_dir, and only recompute the items that
+                were added or changed since the last build (see `_build_incremental()`)
+            compact (bool, optional): bool, default False
+                Store text columns as category, calendar columns as small ints &
+                drop notes, so the columns repeated for every date take a fraction
+                of the memory (see `_compact()`)
+            items (pd.DataFrame, optional): pd.DataFrame, default None
+                Budget Items already parsed (ex. shared by scenarios, see `batch.py`),
+                Columns: see `Models.BudgetItem`. Read from Inputs file if None
+            seasonality (pd.DataFrame, optional): pd.DataFrame, default None
+                Month multipliers already parsed, Columns: see `Models.Seasonality`.
+                Read from Inputs file if None
+            inputs_path (str, optional): str, default None
+                Inputs file to read from, defaults to `Defaults.Paths.Inputs`
+            instrumentation (Instrumentation, optional): Instrumentation, default None
+                Records time, rows & memory of each build step. Off if None
+            schedule_cache (ScheduleCache, optional): ScheduleCache, default None
+                Occurrence dates of Bi-Weekly & Every N items, pass the same cache to
+                several builders to compute each schedule once. New cache if None
+            workers (int, optional): int, default 1
+                Build date_items across this many processes, sharded by item.
+                None for one per CPU. Worth it for large item catalogs, results
+                are pickled back to this process
         """
+        if incremental and not cache_dir:
+            raise ValueError("Need cache_dir to store builds for incremental mode.")
+
         self.min_date = min_date
         self.max_date = max_date
+        self.sparse = sparse
+        self.cache_dir = cache_dir
+        self.incremental = incremental
+        self.compact = compact
+        self.source_items = items
+        self.source_seasonality = seasonality
+        self.inputs_path = inputs_path
+        self.instrumentation = instrumentation or NO_INSTRUMENTATION
+        self.schedule_cache = schedule_cache or ScheduleCache()
+        self.workers = os.cpu_count() if workers is None else workers
+
+    def _compact(self, df: pd.DataFrame, model: dict) -> pd.DataFrame:
+        """Converts a table to the model's memory-optimized dtypes
+
+        Only applied in compact mode, see `Models.Compact`. Dropped columns are
+        not needed to build the budget.
+
+        Parameters
+        ----------
+            df : pd.DataFrame
+            model : dict
+                Dtypes & Drop columns, see `Models.Compact`
+
+        Returns
+        -------
+            pd.DataFrame
+        """
+        if not self.compact:
+            return df
+        df = df.drop(columns=model.get("Drop", []))
+        return df.astype(model["Dtypes"])
+
+    def read_input(self, model: dict) -> pd.DataFrame:
+        """Reads a table of the Inputs file, see `read_dataframe_input()`
+
+        Parameters
+        ----------
+            model : dict
+                see `Models`
+
+        Returns
+        -------
+            pd.DataFrame
+        """
+        if self.inputs_path:
+            model = {**model, "Source": {**model["Source"], "io": self.inputs_path}}
+        return read_dataframe_input(**model, cache_dir=self.cache_dir)
 
     def _get_dates(self):
-        """Reads table of dates from Inputs file
+        """Generates table of dates between min_date & max_date
 
-        Reads table from excel file into pd.DataFrame format. Sets self.dates
+        Reads the month seasonality table from Inputs file (unless given) & builds
+        the calendar around it, see `generate_calendar()`. Sets self.dates
         """
-        dates = read_dataframe_input(**Models.BudgetDate)
-        dates = filter_df_between(
-            dates, "date", (self.min_date, self.max_date), Models.BudgetDate.IndexColumn
+        seasonality = self.source_seasonality
+        if seasonality is None:
+            seasonality = self.read_input(Models.Seasonality)
+        self.dates = self._compact(
+            generate_calendar(self.min_date, self.max_date, seasonality),
+            Models.Compact.BudgetDate,
         )
-        self.dates = dates
 
-    def _get_date_list(self):
-        """One-line description of function
+    def _get_calendar_index(self):
+        """Indexes dates for constant-time lookups
 
-        Multi-line expanded description of function
+        Builds the month ends once from self.dates, see `CalendarIndex`.
+        Sets self.calendar
         """
-        self.date_list = [
-            f"{x['year']}-{x['month_number']}-{x['day_number']}"
-            for _, x in self.dates.iterrows()
-        ]
+        self.calendar = CalendarIndex(self.dates)
 
     def _get_items(self):
         """Reads table of items from Inputs file
 
-        Reads table from excel file into pd.DataFrame format. Sets self.items
+        Reads table from excel file into pd.DataFrame format (unless given).
+        Sets self.items
         """
-        self.items = read_dataframe_input(**Models.BudgetItem)
+        items = self.source_items
+        if items is None:
+            items = self.read_input(Models.BudgetItem)
+        self.items = self._compact(items, Models.Compact.BudgetItem)
+
+    def _get_sparse_date_items(self) -> pd.DataFrame:
+        """Creates candidate occurrences of items on dates
+
+        Rather than pairing every date with every item, each item is joined only to
+        the dates its frequency_type can land on:
+            Daily -> every date
+            Weekly -> frequency_day (or first) day of week
+            Bi-Weekly, Every N -> the dates of its schedule, see `_get_schedules()`
+            Monthly -> frequency_day, or the last day of month (see audit)
+            Annual, One-Time -> frequency_date
+        Inactive items are skipped. Items missing the field their frequency keys on
+        (or an unknown frequency_type) fall back to every date, so the usual
+        validation in `_calc_budget_amounts()` still applies to them.
+
+        Returns
+        -------
+            pd.DataFrame
+                same columns as the cross join of dates & items
+        """
+        dates = self.dates
+        items = self.items[self.items["is_active"].astype(bool)]
+        columns = list(dates.columns) + list(items.columns)
+        frequency_type = items["frequency_type"]
+
+        def join_on(df: pd.DataFrame, date_col: str, key: pd.Series) -> pd.DataFrame:
+            keyed = df.assign(_key=key).dropna(subset=["_key"])
+            return dates.merge(keyed, left_on=date_col, right_on="_key")
+
+        ## Items we cannot key on a date field, along with Daily
+        is_every_n = frequency_type.isin(EVERY_N_FREQUENCIES)
+        is_keyed = (
+            (frequency_type == "Weekly")
+            | (
+                frequency_type.isin(list(STRIDE_FREQUENCIES))
+                & items["start_date"].notnull()
+                & (~is_every_n | (items["frequency_day"] >= 1))
+            )
+            | ((frequency_type == "Monthly") & items["frequency_day"].notnull())
+            | (
+                frequency_type.isin(["Annual", "One-Time"])
+                & pd.to_datetime(items["frequency_date"], errors="coerce").notnull()
+            )
+        )
+        parts = [dates.merge(items[~is_keyed], how="cross")]
+
+        weekly = items[frequency_type == "Weekly"]
+        parts.append(join_on(weekly, "day_of_week", weekly["frequency_day"].fillna(1)))
+
+        stepped = items[is_keyed & frequency_type.isin(list(STRIDE_FREQUENCIES))]
+        if len(stepped):
+            schedules = self._get_schedules(stepped)
+            parts.append(
+                dates.merge(schedules.merge(stepped, on="budget_item_id"), on="date_id")
+            )
+
+        monthly = items[is_keyed & (frequency_type == "Monthly")]
+        ## Real month ends only, a month cut short by min_date/max_date has none
+        last_days = dates[dates["day_number"] == dates["date"].dt.days_in_month]
+        parts.append(join_on(monthly, "day_number", monthly["frequency_day"]))
+        parts.append(last_days.merge(monthly, how="cross"))
+
+        dated = items[is_keyed & frequency_type.isin(["Annual", "One-Time"])]
+        parts.append(
+            join_on(
+                dated, "date", pd.to_datetime(dated["frequency_date"], errors="coerce")
+            )
+        )
+
+        df = pd.concat([x[columns] for x in parts], ignore_index=True)
+        return df.drop_duplicates(subset=["budget_item_id", "date_id"])
 
     def _get_date_items(self):
         """Creates cartesian product of dates and items dataframes
 
         Combines two existing dataframes as a cross join (or cartesian product).
+        In sparse mode, only candidate occurrences are joined instead
+            (see `_get_sparse_date_items()`).
         Sorts by budget_item, then date ascending. Adds a 0-value field for budget amt,
         which we fill in next.
         """
-        df = self.dates.merge(self.items, how="cross")
+        if self.sparse:
+            df = self._get_sparse_date_items()
+        else:
+            df = self.dates.merge(self.items, how="cross")
         df = df.sort_values(
             by=["budget_item_id", "date_id"], ascending=[True, True]
         ).reset_index(drop=True)
         df["budget_item_amount"] = 0.00
         self.date_items = df
 
-    def _is_even_week(self, week_number: int) -> bool:
-        """Boolean check if week_number is even
+    def _audit_date_frequencies(self):
+        """Check validity of dates in date_items
+
+        Frequency defines day of budget in some cases (i.e. always due on 30th of month)
+        If month does not have 30 days, we need to account for this and move to
+            the max existing day in month.
+        Clamps frequency_day to the last day of each row's month, using the month
+            ends from the calendar index (the real month length, so a month cut
+            short by min_date/max_date is not moved to its last date in range). Rows w/o frequency_day are left as-is, as
+            are Every N rows (frequency_day is N, not a day of month).
+        """
+        month_ends = pd.Series(self.calendar.last_days, name="last_day")
+        last_days = self.dates.join(month_ends, on=["year", "month_number"])
+        last_day = self.date_items["date_id"].map(
+            last_days.set_index(Models.BudgetDate.IndexColumn)["last_day"]
+        )
+        frequency_day = self.date_items["frequency_day"]
+        self.date_items["frequency_day"] = frequency_day.where(
+            self.date_items["frequency_type"].isin(EVERY_N_FREQUENCIES),
+            frequency_day.clip(upper=last_day),
+        )
+
+    def _get_stride_date_ids(
+        self, frequency_type: str, frequency_day: float, start_date: datetime
+    ) -> np.ndarray:
+        """Get the dates a stepped schedule occurs on
 
-        Simple math function to check whether week is even or not
-        This is used for frequencies such as 'bi-weekly' so we can understand
-            when to budget for something correctly
+        Steps from start_date by a fixed stride (see `STRIDE_FREQUENCIES`), so the
+        cadence carries across year ends and only the occurrences are generated.
+        Day strides are date arithmetic on date_id (days since min_date + 1).
+        Month strides keep start_date's day, moved to the last day of shorter
+        months (the 31st gives every month end). Validation (end_date, is_active)
+        is applied later.
 
         Parameters
         ----------
-            week_number : int
+            frequency_type : str
+                see `STRIDE_FREQUENCIES`
+            frequency_day : float
+                N for the "Every N" frequencies
+            start_date : datetime
+                first occurrence of the schedule
 
         Returns
         -------
-            bool
-                is_even_week
+            np.ndarray
+                date_id of each occurrence within the calendar
         """
-        return (week_number % 2) == 0
+        unit, step = STRIDE_FREQUENCIES[frequency_type]
+        if frequency_type in EVERY_N_FREQUENCIES:
+            step *= int(frequency_day)
+        min_date = self.dates["date"].iloc[0]
+        n_days = len(self.dates)
+        start_date = pd.Timestamp(start_date).normalize()
+
+        if unit == "days":
+            ## Days from min_date to the first step on/after it
+            offset = (start_date - min_date).days
+            if offset < 0:
+                offset -= (offset // step) * step
+            return np.arange(offset + 1, n_days + 1, step)
+
+        start_month = start_date.year * 12 + start_date.month - 1
+        min_month = min_date.year * 12 + min_date.month - 1
+        last_month = min_month + (n_days + 31) // 28
+        months = np.arange(
+            start_month + max(0, (min_month - start_month) // step) * step,
+            last_month + 1,
+            step,
+        )
+        if not len(months):
+            return months
+        month_starts = pd.to_datetime(
+            {"year": months // 12, "month": months % 12 + 1, "day": 1}
+        )
+        days = np.minimum(start_date.day, month_starts.dt.days_in_month) - 1
+        date_ids = (month_starts - min_date).dt.days.to_numpy() + days.to_numpy() + 1
+        return date_ids[(date_ids >= 1) & (date_ids <= n_days)]
 
-    def _validate_date(self, year: int, month: int, day: int) -> bool:
-        """Boolean check of date validity
+    def _get_schedules(self, items: pd.DataFrame) -> pd.DataFrame:
+        """Get the dates each Bi-Weekly & Every N item occurs on
 
-        Create date based on year, month, day params.
-        Validate based on the date_list created by earlier dates data
+        Each schedule is computed once & kept in self.schedule_cache, keyed on the
+        item's schedule fields (see `SCHEDULE_COLUMNS`) & calendar span, so it is
+        re-used by every row of the item, by items sharing a schedule and by
+        later builds given the same cache.
 
         Parameters
         ----------
-            year : int
-                year of date
-            month : int
-                month of date
-            day : int
-                day in month
+            items : pd.DataFrame
+                stepped items (or rows of date_items, one per item is used)
 
         Returns
         -------
-            bool
-                exists_in_list
+            pd.DataFrame
+                Columns: budget_item_id, date_id
         """
-        return f"{year}-{month}-{day}" in self.date_list
+        id_col = Models.BudgetItem.IndexColumn
+        date_col = Models.BudgetDate.IndexColumn
+        items = items.drop_duplicates(id_col)
+        fingerprints = pd.util.hash_pandas_object(
+            items[SCHEDULE_COLUMNS].astype(object), index=False
+        )
+        span = (self.dates["date"].iloc[0], self.dates["date"].iloc[-1])
+        date_ids = [
+            self.schedule_cache.get(
+                (fingerprint, *span),
+                lambda item=item: self._get_stride_date_ids(*item),
+            )
+            for fingerprint, item in zip(
+                fingerprints,
+                zip(
+                    items["frequency_type"], items["frequency_day"], items["start_date"]
+                ),
+            )
+        ]
+        return pd.DataFrame(
+            {
+                id_col: np.repeat(items[id_col].to_numpy(), [len(x) for x in date_ids]),
+                date_col: np.concatenate(date_ids),
+            }
+        ).astype({id_col: items[id_col].dtype, date_col: self.dates[date_col].dtype})
 
-    def _get_max_day_in_yearmonth(self, year: int, month: int) -> int:
-        """Get max day_number for given month & year
+    def _get_calendar_params(self) -> dict:
+        """Calendar arrays of the frequency kernel, one value per date_id
 
-        Uses existing date_items DF, filters to given year & month, returns maximum
-            day_number based on those params.
+        last_day is the number of days in each date's month, also for months cut
+        short by min_date/max_date.
+
+        Returns
+        -------
+            dict
+                see `kernels.CALENDAR_ARRAYS`
+        """
+        dates = self.dates
+        month_index = dates["year"].astype(np.int64) * 12 + dates["month_number"] - 1
+        last_day = dates["date"].dt.days_in_month
+        return {
+            "ordinal": _to_ordinals(dates["date"]),
+            "day_of_week": dates["day_of_week"].to_numpy(np.int64),
+            "day_number": dates["day_number"].to_numpy(np.int64),
+            "month_index": month_index.to_numpy(np.int64),
+            "last_day": last_day.to_numpy(np.int64),
+            "seasonality": dates["seasonality_multiplier"].to_numpy(np.float64),
+        }
+
+    def _get_item_params(self, items: pd.DataFrame) -> dict:
+        """Item arrays of the frequency kernel, one value per item
+
+        Encodes frequency_type as a kernel code & stride (see
+        `STRIDE_FREQUENCIES`), dates as ordinals (MISSING if blank), and folds
+        the income/expense sign into amount.
 
         Parameters
         ----------
-            year : int
-                given_year
-            month : int
-                given_month
+            items : pd.DataFrame
+                Columns: see `Models.BudgetItem`
 
         Returns
         -------
-            int
-                last_day_in_yearmonth
+            dict
+                see `kernels.ITEM_ARRAYS`
         """
-        return (
-            self.date_items.groupby(["year", "month_number"])["day_number"]
-            .max()
-            .reset_index()
-            .query(f"year == {year} & month_number == {month}")["day_number"]
+        frequency_type = items["frequency_type"].astype(object)
+        frequency_day = items["frequency_day"].astype(np.float64)
+        units = frequency_type.map({k: v[0] for k, v in STRIDE_FREQUENCIES.items()})
+        strides = frequency_type.map({k: v[1] for k, v in STRIDE_FREQUENCIES.items()})
+        step = strides * np.floor(
+            frequency_day.where(frequency_type.isin(EVERY_N_FREQUENCIES), 1.00)
         )
-
-    def _get_date_attribs(self, date: datetime) -> Tuple[int, bool]:
-        """Get additional date attributes
-
-        Gets additional date attributes based on passed datetime.
-        Start day of week (day # in week based on datetime passed) and
-        whether the week was an even week. This is used in bi-weekly freq's
-        to understand what cadence to budget on
+        code = np.select(
+            [
+                frequency_type == "Daily",
+                frequency_type == "Weekly",
+                frequency_type == "Monthly",
+                frequency_type.isin(["Annual", "One-Time"]),
+                units == "days",
+                units == "months",
+            ],
+            [
+                kernels.DAILY,
+                kernels.WEEKLY,
+                kernels.MONTHLY,
+                kernels.DATED,
+                kernels.STRIDE_DAYS,
+                kernels.STRIDE_MONTHS,
+            ],
+            kernels.UNKNOWN,
+        )
+        start_date = pd.to_datetime(items["start_date"], errors="coerce")
+        sign = np.where(items["item_type"] == "Income", 1.00, -1.00)
+        return {
+            "is_active": items["is_active"].to_numpy(bool),
+            "code": code.astype(np.int64),
+            "step": step.fillna(0).to_numpy(np.int64),
+            "day": frequency_day.to_numpy(),
+            "date_ordinal": _to_ordinals(items["frequency_date"]),
+            "start_ordinal": _to_ordinals(start_date),
+            "end_ordinal": _to_ordinals(items["end_date"]),
+            "start_month_index": (
+                start_date.dt.year * 12 + start_date.dt.month - 1
+            ).fillna(0).to_numpy(np.int64),
+            "start_day": start_date.dt.day.fillna(0).to_numpy(np.int64),
+            "amount": items["item_amount"].to_numpy(np.float64) * sign,
+            "is_seasonality": items["is_seasonality"].to_numpy(bool),
+        }
+
+    def _check_items(self, items: pd.DataFrame, params: dict):
+        """Validate fields each frequency_type needs, see `_get_item_params()`
+
+        Only items with a valid record (active, with dates between start_date &
+        end_date in the calendar) are checked.
 
         Parameters
         ----------
-            date : datetime
-                start_date provided to base cadence upon
-
-        Returns
-        -------
-            Tuple[int, bool]
-                day_of_week, is_even_week
+            items : pd.DataFrame
+                Columns: see `Models.BudgetItem`
+            params : dict
+                see `_get_item_params()`
         """
-        iter_date = self.dates[self.dates["date"] == date].iloc[0]
-        start_day_of_week = iter_date["day_of_week"]
-        is_even_week = self._is_even_week(iter_date["week_number"])
-        return (start_day_of_week, is_even_week)
+        ordinals = _to_ordinals(self.dates["date"])
+        start = params["start_ordinal"]
+        end = params["end_ordinal"]
+        has_start = start != kernels.MISSING
+        has_end = end != kernels.MISSING
+        is_valid = params["is_active"].copy()
+        is_valid &= ~has_start | (start <= ordinals.max())
+        is_valid &= ~has_end | (end >= ordinals.min())
+        is_valid &= ~(has_start & has_end) | (start <= end)
+
+        code = params["code"]
+        is_stepped = np.isin(code, [kernels.STRIDE_DAYS, kernels.STRIDE_MONTHS])
+        if (is_valid & is_stepped & ~has_start).any():
+            raise ValueError(
+                "Need startDate for bi-weekly & every N expenses to anchor the cadence."
+            )
+        is_every_n = items["frequency_type"].isin(EVERY_N_FREQUENCIES).to_numpy()
+        if (is_valid & is_every_n & ~(params["day"] >= 1)).any():
+            raise ValueError(
+                "Need frequency_day (N) of at least 1 for every N expenses."
+            )
+        is_dated = code == kernels.DATED
+        if (is_valid & is_dated & (params["date_ordinal"] == kernels.MISSING)).any():
+            raise ValueError("Issue with frequency_date")
+
+        is_unknown = is_valid & (code == kernels.UNKNOWN)
+        if is_unknown.any():
+            print(
+                "Issue -- unknown frequency_type:",
+                items["frequency_type"][is_unknown].unique().tolist(),
+            )
 
-    def _audit_date_frequencies(self):
-        """Check validity of dates in date_items
+    def _calc_budget_amounts(self):
+        """Applies the frequency rules to date_items, see `kernels.budget_amounts()`
 
-        Frequency defines day of budget in some cases (i.e. always due on 30th of month)
-        If month does not have 30 days, we need to account for this and move to
-            the max existing day in month.
-        Iterates over rows in date_items, skips rows w/o frequency_day
-        If row has an invalid date, set to max_day_in_yearmonth
+        Item fields & the calendar are encoded as arrays once, then each row
+        only carries its item & date positions into the kernel.
+        In sparse mode, records that do not occur are dropped
         """
-        for index, row in self.date_items.iterrows():
-            if pd.isnull(row["frequency_day"]):
-                continue
-            if self._validate_date(
-                row["year"], row["month_number"], int(row["frequency_day"])
-            ):
-                continue
-            else:
-                new_day = self._get_max_day_in_yearmonth(
-                    row["year"], row["month_number"]
-                )
-                self.date_items.at[index, "frequency_day"] = new_day
-
-    def _calc_multiplier(self, row: dict) -> float:
-        """Calculate multiplier for budget_amount
+        id_col = Models.BudgetItem.IndexColumn
+        params = self._get_item_params(self.items)
+        self._check_items(self.items, params)
+        item_pos = pd.Index(self.items[id_col]).get_indexer(self.date_items[id_col])
+        ## date_id counts days from min_date, see `generate_calendar()`
+        date_pos = self.date_items[Models.BudgetDate.IndexColumn].to_numpy(np.int64) - 1
+        amounts, occurs = kernels.budget_amounts(
+            item_pos, date_pos, self._get_calendar_params(), params
+        )
+        self.date_items["budget_item_amount"] = amounts
+        if self.sparse:
+            self.date_items = self.date_items[occurs].reset_index(drop=True)
 
-        Calculates multiplier applied to input budget value
-        If income, keep number positive else negative (expense)
-        If seasonality applied, add seasonality_multiplier on top
+    def _build_date_items(self):
+        """Runs steps to create date_items from self.items
 
-        Parameters
-        ----------
-            row : dict
-                row: dict (pd.DataFrame row)
+        With more than one worker, see `_build_date_items_parallel()`
+        """
+        stage = self.instrumentation.stage
+
+        def rows() -> int:
+            return len(self.date_items)
+
+        if self.workers > 1 and len(self.items) > 1:
+            with stage("DataBuilder._build_date_items_parallel", rows):
+                self._build_date_items_parallel()
+            return
+
+        with stage("DataBuilder._get_date_items", rows):
+            self._get_date_items()
+        with stage("DataBuilder._audit_date_frequencies", rows):
+            self._audit_date_frequencies()
+        with stage("DataBuilder._calc_budget_amounts", rows):
+            self._calc_budget_amounts()
+
+    def _build_date_items_parallel(self):
+        """Runs steps to create date_items across a process pool
+
+        Items are independent, so self.items is split into shards of consecutive
+        budget_item_id (SHARDS_PER_WORKER per worker), each built by the usual
+        steps in a worker (see `_build_item_shard()`). The calendar is sent to
+        each worker once, when it starts. Shards come back in order, so
+        concatenating them keeps date_items sorted by budget_item_id, date_id.
+        """
+        id_col = Models.BudgetItem.IndexColumn
+        items = self.items.sort_values(id_col)
+        n_shards = min(len(items), self.workers * SHARDS_PER_WORKER)
+        bounds = np.linspace(0, len(items), n_shards + 1).astype(int)
+        shards = [items.iloc[start:end] for start, end in zip(bounds, bounds[1:])]
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_shard_worker,
+            initargs=(self.dates, self.sparse),
+        ) as executor:
+            self.date_items = pd.concat(
+                executor.map(_build_item_shard, shards), ignore_index=True
+            )
+
+    def _get_item_fingerprints(self) -> pd.Series:
+        """Hashes every field of each item, other than budget_item_id
 
         Returns
         -------
-            float
-                multiplier
+            pd.Series
+                uint64 fingerprint per item, aligned to self.items
         """
-        return (1.00 if row["item_type"] == "Income" else -1.00) * (
-            row["seasonality_multiplier"] if row["is_seasonality"] else 1.00
+        return pd.util.hash_pandas_object(
+            self.items.drop(columns=[Models.BudgetItem.IndexColumn]), index=False
         )
 
-    def _validate_record(self, row: dict) -> bool:
-        """Validate basic requirements for date_item
+    def _get_build_path(self) -> str:
+        """Path of the stored build used in incremental mode"""
+        return os.path.join(self.cache_dir, "date_items.pkl")
 
-        A few criterae to check before running through freq_types
-            1 - if inactive record, return false
-            2 - if end_date exists and date is past end, return false
-            3 - if start_date exists and date is before start, return false
-
-        Parameters
-        ----------
-            row : dict
-                row: dict (pd.DataFrame row)
+    def _get_build_key(self) -> str:
+        """Key of everything other than items that date_items depend on
 
         Returns
         -------
-            bool
-                is valid record
+            str
+                hash of dates (horizon, seasonality), build mode & BUILD_VERSION
         """
-        if not row["is_active"]:
-            return False
+        return (
+            f"{get_df_hash(self.dates)}-{self.sparse}-{self.compact}-v{BUILD_VERSION}"
+        )
 
-        if not pd.isnull(row["end_date"]) and row["date"] > row["end_date"]:
-            ## print(f"Skipping end date.. {row['endDate']}, {row['date']}")
-            return False
+    def _build_incremental(self):
+        """Creates date_items, re-using the previous build where possible
 
-        if not pd.isnull(row["start_date"]) and row["date"] < row["start_date"]:
-            ## print(f"Skipping start date.. {row['startDate']}, {row['date']}")
-            return False
+        Items are matched to the previous build by fingerprint (see
+        `_get_item_fingerprints()`), so rows moving around in the Inputs file are
+        still re-used. Rows of unchanged items are copied over with their new
+        budget_item_id, added or changed items run through the usual steps.
+        Previous build is discarded if dates, build mode or BUILD_VERSION changed.
+        Stores the resulting date_items for the next build.
+        """
+        id_col = Models.BudgetItem.IndexColumn
+        items = self.items
+        fingerprints = self._get_item_fingerprints()
+        build_key = self._get_build_key()
+
+        is_changed = pd.Series(True, index=items.index)
+        reused = None
+        build_path = self._get_build_path()
+        previous = pd.read_pickle(build_path) if os.path.exists(build_path) else None
+        if previous is not None and previous["key"] == build_key:
+            previous_items = previous["date_items"]
+            ## One previous item per fingerprint, in case of duplicate items
+            previous_ids = previous_items.groupby("item_fingerprint")[id_col].first()
+            new_ids = pd.DataFrame(
+                {"item_fingerprint": fingerprints, "new_id": items[id_col]}
+            )
+            new_ids = new_ids[new_ids["item_fingerprint"].isin(previous_ids.index)]
+            reused = previous_items[previous_items[id_col].isin(previous_ids)].merge(
+                new_ids, on="item_fingerprint"
+            )
+            reused[id_col] = reused.pop("new_id")
+            reused = reused.drop(columns=["item_fingerprint"])
+            is_changed = ~fingerprints.isin(new_ids["item_fingerprint"])
+
+        self.items = items[is_changed]
+        self._build_date_items()
+        self.items = items
+        df = self.date_items
+        if reused is not None and len(reused):
+            reused = reused[df.columns].astype(df.dtypes.to_dict())
+            df = pd.concat([df, reused], ignore_index=True) if len(df) else reused
+        self.date_items = df.sort_values(
+            by=[id_col, "date_id"], ascending=[True, True]
+        ).reset_index(drop=True)
 
-        return True
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pd.to_pickle(
+            {
+                "key": build_key,
+                "date_items": self.date_items.assign(
+                    item_fingerprint=self.date_items[id_col].map(
+                        pd.Series(fingerprints.values, index=items[id_col])
+                    )
+                ),
+            },
+            build_path,
+        )
 
-    def _calculate_budget_amount(self, row: dict) -> float:
-        """Calculate budget amount for record in date_items
+    def build_data_model(self):
+        """Runs individual steps to create data model"""
+        stage = self.instrumentation.stage
+        with stage("DataBuilder._get_dates", lambda: len(self.dates)):
+            self._get_dates()
+        with stage("DataBuilder._get_calendar_index"):
+            self._get_calendar_index()
+        with stage("DataBuilder._get_items", lambda: len(self.items)):
+            self._get_items()
+        if self.incremental:
+            with stage("DataBuilder._build_incremental", lambda: len(self.date_items)):
+                self._build_incremental()
+        else:
+            self._build_date_items()
 
-        Performs validation_check on record
-        Checks by frequency_type for matching criteria
-        Returns item_amount * calc_multiplier for records we want to budget for
-            else 0.00
+    def get_df(self) -> pd.DataFrame:
+        """Get DF limited to fields for tool
+
+        Returns
+        -------
+            pd.DataFrame
+                data model
+        """
+        return self.date_items[Models.ExportData.Columns]
+
+    def get_cash_balance(
+        self, opening_balance: Union[float, dict] = 0.00, by: str = None
+    ) -> pd.DataFrame:
+        """Projects the running balance for every day of the budget
+
+        Sums budget_item_amount per day (and group), fills days without any
+        amount with 0.00 & takes a cumulative sum in date order, so the cost is
+        a groupby & a cumsum however long the horizon.
 
         Parameters
         ----------
-            row : dict
-                row of pd.Dataframe
+            opening_balance (Union[float, dict], optional): float, default 0.00
+                Balance before min_date, or group -> balance if by is set
+                (missing groups start at 0.00, a non-zero float is rejected
+                as it would be counted once per group)
+            by (str, optional): str, default None
+                Column of the detail to keep a balance per value of
+                (ex. "display_group"), one overall balance if None
 
         Returns
         -------
-            float
-                budget_amount
+            pd.DataFrame
+                one row per date (and group), Columns: date_id, date, [by],
+                inflow, outflow, net_amount, balance, is_min_balance (the day(s)
+                of the lowest balance, per group)
         """
-        if not self._validate_record(row):
-            return 0.00
-
-        ## Daily -> Return Budgeted Amount
-        if row["frequency_type"] == "Daily":
-            return row["item_amount"] * self._calc_multiplier(row)
-
-        ## Weekly ->
-        elif row["frequency_type"] == "Weekly":
-            ## If Limited to a Day, Ignore other Days
-            if (
-                not pd.isnull(row["frequency_day"])
-                and row["day_of_week"] != row["frequency_day"]
-            ):
-                return 0.00
-            ## If same day as limited, or no limited day (and day_number == 1)
-            elif (row["day_of_week"] == row["frequency_day"]) or (
-                pd.isnull(row["frequency_day"]) and row["day_of_week"] == 1
-            ):
-                return row["item_amount"] * self._calc_multiplier(row)
-            else:
-                return 0.00
-
-        ##Bi-Weekly ->
-        elif row["frequency_type"] == "Bi-Weekly":
-            ##If no start-date, raise exception
-            if pd.isnull(row["start_date"]):
-                raise ValueError(
-                    "Need startDate for bi-weekly expense to determine alternating weeks."
-                )
-            ##If start date, validate start day of week & even/odd week increments
-            else:
-                start_day_of_week, is_even_week = self._get_date_attribs(
-                    row["start_date"]
+        if by and not isinstance(opening_balance, dict) and opening_balance:
+            raise ValueError(
+                f"Opening balance {opening_balance} can't be split by {by},"
+                f" pass a dict of {by} -> opening balance instead."
+            )
+        date_col = Models.BudgetDate.IndexColumn
+        keys = [date_col] + ([by] if by else [])
+        amount = self.date_items["budget_item_amount"]
+        flows = (
+            self.date_items[keys]
+            .assign(inflow=amount.clip(lower=0.00), outflow=amount.clip(upper=0.00))
+            .groupby(keys, observed=True)[["inflow", "outflow"]]
+            .sum()
+        )
+        date_ids = self.dates[date_col]
+        if by:
+            groups = self.date_items[by].drop_duplicates().sort_values()
+            flows = flows.reindex(
+                pd.MultiIndex.from_product([date_ids, groups], names=keys),
+                fill_value=0.00,
+            )
+            opening = opening_balance
+            if isinstance(opening_balance, dict):
+                opening = (
+                    pd.Series(
+                        flows.index.get_level_values(by).astype(object),
+                        index=flows.index,
+                    )
+                    .map(opening_balance)
+                    .fillna(0.00)
                 )
-                if (
-                    self._is_even_week(row["week_number"]) == is_even_week
-                    and row["day_of_week"] == start_day_of_week
-                ):
-                    return row["item_amount"] * self._calc_multiplier(row)
-                else:
-                    return 0.00
-
-        ##Monthly ->
-        elif row["frequency_type"] == "Monthly":
-            ##If limited to day of month
-            if not pd.isnull(row["frequency_day"]):
-                ##If not same day, return 0
-                if row["day_number"] != row["frequency_day"]:
-                    return 0.00
-                ##Otherwise, calc
-                else:
-                    return row["item_amount"] * self._calc_multiplier(row)
-
-            ##If not limited to day of month & is first of month, return
-            elif pd.isnull(row["frequency_day"]) and row["frequency_day"] == 1:
-                return row["item_amount"] * self._calc_multiplier(row)
-            ##Otherwise 0
-            else:
-                return 0.00
-
-        ##Annual ->
-        elif row["frequency_type"] == "Annual":
-            if pd.isnull(row["frequency_date"]):
-                raise ValueError("Issue with frequency_date")
-            elif (
-                not pd.isnull(row["frequency_date"])
-                and row["date"] == row["frequency_date"]
-            ):
-                return row["item_amount"] * self._calc_multiplier(row)
-            else:
-                return 0.00
-
-        ##One-Time ->
-        elif row["frequency_type"] == "One-Time":
-            if pd.isnull(row["frequency_date"]):
-                raise ValueError("Issue with frequency_date")
-            elif row["date"] == row["frequency_date"]:
-                return row["item_amount"] * self._calc_multiplier(row)
-            else:
-                return 0.00
-
-        print(row)
-        print("Issue -- did not make it through an IF")
-        return 0.00
+        else:
+            flows = flows.reindex(pd.Index(date_ids, name=date_col), fill_value=0.00)
+            opening = opening_balance
+
+        flows["net_amount"] = flows["inflow"] + flows["outflow"]
+        running = flows.groupby(level=by)["net_amount"] if by else flows["net_amount"]
+        flows["balance"] = running.cumsum() + opening
+        lowest = (
+            flows.groupby(level=by)["balance"].transform("min")
+            if by
+            else flows["balance"].min()
+        )
+        flows["is_min_balance"] = flows["balance"] == lowest
 
-    def _calc_budget_amounts(self):
-        """Applies function to each row in date_items
+        df = flows.reset_index()
+        df.insert(1, "date", df[date_col].map(self.dates.set_index(date_col)["date"]))
+        return df
 
-        Calculates budget_amount field using above function
-        """
-        self.date_items["budget_item_amount"] = self.date_items.apply(
-            lambda x: self._calculate_budget_amount(x), axis=1
-        )
+    def export(
+        self, path: str, data_format: str = None, partition_by_year: bool = False
+    ) -> str:
+        """Writes the data model (see `get_df()`) to CSV, Parquet or Arrow IPC
 
-    def build_data_model(self):
-        """Runs individual steps to create data model"""
-        self._get_dates()
-        self._get_date_list()
-        self._get_items()
-        self._get_date_items()
-        self._audit_date_frequencies()
-        self._calc_budget_amounts()
+        For tools that read the budget detail without the workbook, read back
+        with `utils.read_dataframe_output()` (memory-mapped).
 
-    def get_df(self) -> pd.DataFrame:
-        """Get DF limited to fields for tool
+        Parameters
+        ----------
+            path : str
+                file, or directory if partitioned
+            data_format (str, optional): str, default None
+                see `Defaults.DataFormats`, inferred from the extension if None
+            partition_by_year (bool, optional): bool, default False
+                Write a `year=YYYY` sub-directory per year (see
+                `write_dataframe_output()`)
 
         Returns
         -------
-            pd.DataFrame
-                data model
+            str
+                path written to
         """
-        df = self.date_items.copy()
-        df = df[Models.ExportData.Columns]
-        return df
+        return write_dataframe_output(
+            self.get_df(),
+            path,
+            data_format,
+            partition_cols=["year"] if partition_by_year else None,
+        )
+
+
+def _to_ordinals(values: pd.Series) -> np.ndarray:
+    """Dates as days since epoch, `kernels.MISSING` where blank/invalid"""
+    dates = pd.to_datetime(pd.Series(values).astype(object), errors="coerce")
+    ## NaT is stored as the minimum int64, the same value as MISSING
+    return dates.to_numpy("datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+
+
+## Calendar & build mode of a parallel build, set once per worker process
+_shard_builder = None
+
+
+def _init_shard_worker(dates: pd.DataFrame, sparse: bool):
+    """Sets up the DataBuilder a worker builds its shards with
+
+    Parameters
+    ----------
+        dates : pd.DataFrame
+            calendar of the build, see `DataBuilder._get_dates()`
+        sparse : bool
+            see `DataBuilder`
+    """
+    global _shard_builder
+    _shard_builder = DataBuilder(
+        dates["date"].iloc[0], dates["date"].iloc[-1], sparse=sparse
+    )
+    _shard_builder.dates = dates
+    _shard_builder._get_calendar_index()
+
+
+def _build_item_shard(items: pd.DataFrame) -> pd.DataFrame:
+    """Builds date_items of a shard of items, in a worker process
+
+    Parameters
+    ----------
+        items : pd.DataFrame
+            Columns: see `Models.BudgetItem`
+
+    Returns
+    -------
+        pd.DataFrame
+            date_items of the shard
+    """
+    _shard_builder.items = items
+    _shard_builder._build_date_items()
+    return _shard_builder.date_items
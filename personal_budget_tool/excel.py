@@ -1,19 +1,37 @@
+import glob
 import os
 import pandas as pd
-import xlwings as xw
 from typing import Tuple, Union
 from datetime import datetime, date, timedelta
 
-from constants import Defaults, Excel
-from utils import get_col_char
+from constants import Defaults, Excel, Models
+from instrument import Instrumentation, NO_INSTRUMENTATION
+from utils import get_col_char, get_df_hash
+from writers import BaseWriter, BatchWriter, Sheet, SheetRange, get_writer
 
-TEMPLATE_PATH = "../src/Template.xlsx"
+TEMPLATE_PATH = Defaults.Paths.Template
 TEMPLATE_SHEET = "Template"
-SAVE_PATH = "" "../src/output"
+DATA_SHEET = "Data"
+CASH_BALANCE_SHEET = "Cash Balance"
+SAVE_PATH = Defaults.Paths.Output
+
+DATA_CHUNK_ROWS = 50000
+## Summary aggregates kept in cache_dir, see `BudgetApp._get_summary_tables()`
+SUMMARY_CACHE_ENTRIES = 16
+MAX_SHEET_ROWS = 1048576
+
+## Columns of the detail the Summary is aggregated from, see `_aggregate_summary()`
+SUMMARY_COLUMNS = [
+    "item_name",
+    "display_group",
+    "month_number",
+    "year",
+    "budget_item_amount",
+]
 
 
 class BudgetApp:
-    """Class used for creating the budget using xlwings
+    """Class used for creating the budget workbook
 
     Attributes
     ----------
@@ -23,21 +41,39 @@ class BudgetApp:
             End date for the budget
         df : pd.DataFrame
             Data df from the `DataBuilder` class
-        wb : xlwings.Book
-            Instance of the workbook, see `build()`
-        sht : xlwings.Book.Sheet
-            Instance of the workbook sheet, see `build()`
+        writer : BaseWriter
+            Backend the workbook is written with, see `writers.Writers`
+        instrumentation : Instrumentation
+            Measures each phase of `build()`, see `instrument.py`
+        cache_dir : str
+            Directory the Summary aggregates are cached in, see `_get_summary_tables()`
+        cash_balance : pd.DataFrame
+            Daily running balance, written to its own sheet if set
 
     Methods
     -------
         build():
-            Initializes the xlwings attributes, generates the file.
+            Opens the template with the writer, generates the file.
         save_and_close():
-            Saves the xlwings.Book, closes out of the process/instance.
+            Saves the workbook, closes out of the process/instance.
 
     """
 
-    def __init__(self, min_date: datetime, max_date: datetime, df: pd.DataFrame):
+    def __init__(
+        self,
+        min_date: datetime,
+        max_date: datetime,
+        df: pd.DataFrame,
+        backend: Union[str, BaseWriter] = "xlwings",
+        batch: bool = True,
+        summary_mode: Excel.SummaryMode = Excel.SummaryMode.Formulas,
+        data_overflow: Excel.DataOverflow = Excel.DataOverflow.Sheets,
+        template_path: str = None,
+        save_path: str = None,
+        instrumentation: Instrumentation = None,
+        cache_dir: str = None,
+        cash_balance: pd.DataFrame = None,
+    ):
         """Initializes BudgetApp object
 
         Parameters
@@ -48,37 +84,193 @@ class BudgetApp:
                 End date for the budget
             df : pd.DataFrame
                 Data df from the `DataBuilder` class
+            backend (Union[str, BaseWriter], optional): str, default "xlwings"
+                "xlwings" drives a live Excel instance,
+                "openpyxl" writes the .xlsx file directly (no Excel required)
+            batch (bool, optional): bool, default True
+                Record Summary writes & styles during `build()`, flush them to the
+                backend in bulk at the end (see `writers.BatchWriter`)
+            summary_mode (Excel.SummaryMode, optional): str, default "formulas"
+                How item x month cells on the Summary are filled
+                "formulas" - SUMIFS over whole columns of the Data sheet
+                "bounded" - SUMIFS limited to the rows written to the Data sheet
+                "values" - static totals, calculated in pandas
+            data_overflow (Excel.DataOverflow, optional): str, default "sheets"
+                Where budget detail goes if it does not fit on one sheet,
+                requires summary_mode "values"
+                "sheets" - continues on sheets `Data (2)`, `Data (3)`..
+                "file" - written to a csv file next to the workbook instead
+            template_path (str, optional): str, default TEMPLATE_PATH
+                Workbook the budget is built from
+            save_path (str, optional): str, default SAVE_PATH
+                Directory the budget workbook is saved to
+            instrumentation (Instrumentation, optional): Instrumentation, default None
+                Records time & memory of each build phase. Off if None
+            cache_dir (str, optional): str, default None
+                Cache the Summary aggregates in this directory, re-used while the
+                detail is unchanged. No caching if None
+            cash_balance (pd.DataFrame, optional): pd.DataFrame, default None
+                From `DataBuilder.get_cash_balance()`, written to a
+                `Cash Balance` sheet after the data sheet (see `_update_cash_balance()`)
         """
+        if summary_mode not in Excel.SummaryMode.values():
+            raise ValueError(
+                f"Unknown summary_mode {summary_mode}, "
+                f"expected one of {list(Excel.SummaryMode.values())}"
+            )
+        if data_overflow not in Excel.DataOverflow.values():
+            raise ValueError(
+                f"Unknown data_overflow {data_overflow}, "
+                f"expected one of {list(Excel.DataOverflow.values())}"
+            )
         self.min_date = min_date
         self.max_date = max_date
         self.df = df
-
-        self.wb = None
-        self.sheet = None
+        self.summary_mode = summary_mode
+        self.data_overflow = data_overflow
+        self.template_path = template_path or TEMPLATE_PATH
+        self.save_path = save_path or SAVE_PATH
+        self.instrumentation = instrumentation or NO_INSTRUMENTATION
+        self.cache_dir = cache_dir
+        self.cash_balance = cash_balance
+
+        self.writer = get_writer(backend)
+        if batch:
+            self.writer = BatchWriter(self.writer)
 
         self._income_total_row = None
         self._expense_total_rows = []
         self._new_year_cols = []
+        self._item_totals = None
+        self._summary_tables = None
+
+    def _aggregate_summary(self) -> dict:
+        """Aggregates self.df for the Summary sheet, in a single pass
+
+        Groups the detail once by display group, item & month, every Summary
+        table is then derived from that (much smaller) result.
+
+        Returns
+        -------
+            dict
+                month_years - see `_get_unique_months()`
+                items - see `_get_items()`
+                category_groups - see `_get_category_groups()`
+                item_totals - budget amount, Index: item_name,
+                    Columns: (month_number, year)
+        """
+        df = self.df[SUMMARY_COLUMNS]
+        amount = df["budget_item_amount"]
+        totals = (
+            df.assign(
+                budget_item_amount_abs=amount.abs(),
+                ## Row of the first positive amount, months are listed in that order
+                first_positive=pd.Series(range(len(df)), index=df.index).where(
+                    amount > 0
+                ),
+            )
+            .groupby(
+                ["display_group", "item_name", "month_number", "year"], observed=True
+            )
+            .agg(
+                budget_item_amount=("budget_item_amount", "sum"),
+                budget_item_amount_abs=("budget_item_amount_abs", "sum"),
+                first_positive=("first_positive", "min"),
+            )
+            .reset_index()
+        )
+
+        months = (
+            totals.groupby(["month_number", "year"])["first_positive"]
+            .min()
+            .dropna()
+            .sort_values()
+        )
+
+        def sort_abs(sums: Union[pd.Series, pd.DataFrame]) -> pd.DataFrame:
+            return (
+                sums.reset_index()
+                .sort_values(by=["budget_item_amount_abs"], ascending=False)
+                .reset_index(drop=True)
+            )
+
+        return {
+            "month_years": [(int(month), int(year)) for month, year in months.index],
+            "items": sort_abs(
+                totals.groupby(["item_name", "display_group"], observed=True)[
+                    ["budget_item_amount", "budget_item_amount_abs"]
+                ].sum()
+            ),
+            "category_groups": sort_abs(
+                totals.groupby("display_group", observed=True)[
+                    "budget_item_amount_abs"
+                ].sum()
+            ),
+            "item_totals": (
+                totals.groupby(["item_name", "month_number", "year"], observed=True)[
+                    "budget_item_amount"
+                ]
+                .sum()
+                .unstack(["month_number", "year"])
+            ),
+        }
+
+    def _get_summary_tables(self) -> dict:
+        """Gets the Summary aggregates (see `_aggregate_summary()`)
+
+        Computed once per BudgetApp. With cache_dir, also stored on disk keyed on
+        a hash of the columns aggregated, so re-rendering the same detail (ex.
+        with another template or backend) skips aggregation. The most recently
+        used SUMMARY_CACHE_ENTRIES are kept, so workbooks & scenarios sharing a
+        cache_dir do not evict each other.
+
+        Returns
+        -------
+            dict
+        """
+        if self._summary_tables is not None:
+            return self._summary_tables
+
+        cache_path = None
+        if self.cache_dir:
+            key = get_df_hash(self.df[SUMMARY_COLUMNS])[:16]
+            cache_path = os.path.join(self.cache_dir, f"summary-{key}.pkl")
+            if os.path.exists(cache_path):
+                self._summary_tables = pd.read_pickle(cache_path)
+                ## Mark as recently used, see `_evict_summary_cache()`
+                os.utime(cache_path)
+                return self._summary_tables
+
+        self._summary_tables = self._aggregate_summary()
+        if cache_path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            pd.to_pickle(self._summary_tables, cache_path)
+            self._evict_summary_cache()
+        return self._summary_tables
+
+    def _evict_summary_cache(self):
+        """Keeps the SUMMARY_CACHE_ENTRIES most recently used aggregates in cache_dir"""
+        paths = glob.glob(os.path.join(glob.escape(self.cache_dir), "summary-*.pkl"))
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for stale_path in paths[SUMMARY_CACHE_ENTRIES:]:
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                ## Already evicted by a build sharing the cache_dir
+                pass
 
     def _get_unique_months(self) -> list:
         """Returns unique list of month_year from self.df
 
-        Note: only month_year with budget_item_amount > 0 are returned.
+        Note: only month_year with budget_item_amount > 0 are returned, in order of
+        their first row in self.df.
 
         Returns
         -------
             list
                 List of each month_year combination ex. `[(month, year)]`
         """
-        return [
-            (x["month_number"], x["year"])
-            for _, x in self.df[self.df["budget_item_amount"] > 0][
-                ["month_number", "year"]
-            ]
-            .drop_duplicates()
-            .reset_index(drop=True)
-            .iterrows()
-        ]
+        return self._get_summary_tables()["month_years"]
 
     def _get_items(self) -> pd.DataFrame:
         """Gets dataframe with list/group information
@@ -95,26 +287,7 @@ class BudgetApp:
                     Name: budget_item_amount, dtype: float64
                     Name: budget_item_amount_abs, dtype: float64
         """
-        df_copy = self.df.copy()
-        df_copy["budget_item_amount_abs"] = abs(df_copy["budget_item_amount"])
-        df_copy = df_copy[
-            [
-                "item_name",
-                "display_group",
-                "budget_item_amount",
-                "budget_item_amount_abs",
-            ]
-        ]
-        it = (
-            df_copy.groupby(["item_name", "display_group"])[
-                ["budget_item_amount", "budget_item_amount_abs"]
-            ]
-            .sum()
-            .reset_index()
-            .sort_values(by=["budget_item_amount_abs"], ascending=False)
-            .reset_index(drop=True)
-        )
-        return it
+        return self._get_summary_tables()["items"]
 
     def _get_category_groups(self) -> pd.DataFrame:
         """Gets dataframe with group(only) information
@@ -130,19 +303,58 @@ class BudgetApp:
                     Name: display_group, dtype: object
                     Name: budget_item_amount_abs, dtype: float64
         """
-        df_copy = self.df.copy()
-        df_copy["budget_item_amount_abs"] = abs(df_copy["budget_item_amount_abs"])
+        return self._get_summary_tables()["category_groups"]
+
+    def _get_item_totals(self, month_years: list) -> pd.DataFrame:
+        """Gets budget amount by item & month, for summary_mode "values"
+
+        Matches the SUMIFS formulas: by item_name (across display groups),
+        0 for months w/o any budget amount
+
+        Parameters
+        ----------
+            month_years : list
+                see `_get_unique_months()`
+
+        Returns
+        -------
+            pd.DataFrame
+                Index: item_name, Columns: (month_number, year) in month_years order
+        """
         return (
-            df_copy.items.groupby("display_group")["budget_item_amount_abs"]
-            .sum()
-            .reset_index()
-            .sort_values(by=["budget_item_amount_abs"], ascending=False)
-            .reset_index(drop=True)
+            self._get_summary_tables()["item_totals"]
+            .reindex(columns=pd.MultiIndex.from_tuples(month_years))
+            .fillna(0.00)
+        )
+
+    def _get_item_formula(self) -> str:
+        """Gets SUMIFS formula for the first month of an item row
+
+        Data sheet columns are located from `Models.ExportData`.
+        For summary_mode "bounded", ranges stop at the last row of data.
+
+        Returns
+        -------
+            str
+                formula, relative to column D
+        """
+
+        def data_range(column: str) -> str:
+            col = get_col_char(Models.ExportData.Columns.index(column) + 1)
+            if self.summary_mode == Excel.SummaryMode.Bounded:
+                return f"{DATA_SHEET}!${col}$2:${col}${len(self.df) + 1}"
+            return f"{DATA_SHEET}!${col}:${col}"
+
+        return (
+            f"=IFERROR(SUMIFS({data_range('budget_item_amount')},"
+            f"{data_range('item_name')},@$B:$B,"
+            f"{data_range('year')},D$7,"
+            f"{data_range('month_number')},D$6),0)"
         )
 
     def _format_range(
         self,
-        range: xw.Range,
+        range: SheetRange,
         value: Union[str, int] = None,
         formula: str = None,
         format: Excel.FormatType = None,
@@ -156,11 +368,11 @@ class BudgetApp:
         line_style: Excel.LineStyle = Excel.LineStyle.xlContinuous,
         border_weight: Excel.BorderWeight = Excel.BorderWeight.xlThin,
     ):
-        """Reusable commands to format an xlwings.Sheet.Range
+        """Reusable commands to format a range through the writer
 
         Parameters
         ----------
-            range : xw.Range
+            range : SheetRange
             value (Union[str, int], optional): Union[str, int], default None
                 Sets cell value(s)
             formula (str, optional): str, default None
@@ -189,51 +401,119 @@ class BudgetApp:
                 int inherited from constants
         """
         if value:
-            range.value = value
+            self.writer.set_value(range, value)
         if formula:
-            range.formula = formula
-        if format:
-            range.number_format = format
-        if font_size:
-            range.font.size = font_size
-        if font_name:
-            range.font.name = font_name
-        if bold:
-            range.font.bold = True
-        if italic:
-            range.font.italic = True
-        if underline:
-            range.api.Font.Underline = 2
+            self.writer.set_formula(range, formula)
+        if format or font_size or font_name or bold or italic or underline:
+            self.writer.set_format(
+                range,
+                number_format=format,
+                font_size=font_size,
+                font_name=font_name,
+                bold=bold,
+                italic=italic,
+                underline=underline,
+            )
         if border:
-            range.api.Borders(border_pos).LineStyle = line_style
-            range.api.Borders(border_pos).Weight = border_weight
+            self.writer.set_border(range, border_pos, line_style, border_weight)
 
-    def _create_xlInstance(self):
-        """Initializes xlwings.Book instance
+    def _open_workbook(self):
+        """Opens workbook template with the writer
 
-        Opens workbook template, forces display front-center
+        For xlwings, also forces display front-center
         """
-        self.wb = xw.Book(TEMPLATE_PATH)
-        self.wb.app.activate(steal_focus=True)
+        self.writer.open(self.template_path)
+
+    def _get_save_path(self) -> str:
+        """Path the workbook is saved to, see `save_and_close()`"""
+        return os.path.join(
+            self.save_path, f"Budget Tool {datetime.now().strftime('%Y%m%d')}.xlsx"
+        )
+
+    def _write_data_rows(self, detail: Sheet, df: pd.DataFrame):
+        """Writes rows of budget detail below the header of a data sheet
+
+        Written in chunks of DATA_CHUNK_ROWS, so only one chunk is converted
+        for the backend at a time.
+
+        Parameters
+        ----------
+            detail : Sheet
+                context of data sheet
+            df : pd.DataFrame
+                rows to write
+        """
+        for start in range(0, len(df), DATA_CHUNK_ROWS):
+            self.writer.write_frame(
+                detail.range(f"A{start + 2}"), df.iloc[start : start + DATA_CHUNK_ROWS]
+            )
 
     def _update_data(self):
         """Writes budget detail to data sheet
 
         Using workbook context, identify data sheet, identify range
         of existing data (if any), clear contents, paste DF in upper-left of range
+        If the detail does not fit on the sheet, see `data_overflow`
         """
-        detail = self.wb.sheets["Data"]
-        detail.range("A2:T100000").clear_contents()
-        detail.range("A2").options(index=False, header=False).value = self.df
+        detail = self.writer.sheet(DATA_SHEET)
+        last_col = get_col_char(len(self.df.columns))
+        last_row = self.writer.get_last_row(detail.name)
+        if last_row > 1:
+            self.writer.clear_contents(detail.range(f"A2:{last_col}{last_row}"))
+
+        sheet_rows = MAX_SHEET_ROWS - 1
+        if len(self.df) <= sheet_rows:
+            self._write_data_rows(detail, self.df)
+            return
+
+        if self.summary_mode != Excel.SummaryMode.Values:
+            raise ValueError(
+                f"{len(self.df)} rows of detail do not fit on the {DATA_SHEET} sheet,"
+                f" use summary_mode '{Excel.SummaryMode.Values}'."
+            )
+        if self.data_overflow == Excel.DataOverflow.File:
+            data_path = self._get_save_path().replace(".xlsx", f" {DATA_SHEET}.csv")
+            os.makedirs(os.path.dirname(data_path), exist_ok=True)
+            self.df.to_csv(data_path, index=False, chunksize=DATA_CHUNK_ROWS)
+            return
+
+        header = detail.range(f"A1:{last_col}1")
+        for sheet_index, start in enumerate(range(0, len(self.df), sheet_rows)):
+            if sheet_index:
+                name = f"{DATA_SHEET} ({sheet_index + 1})"
+                self.writer.add_sheet(name, after=detail.name)
+                self.writer.copy_range(header, self.writer.sheet(name).range("A1"))
+                detail = self.writer.sheet(name)
+            self._write_data_rows(detail, self.df.iloc[start : start + sheet_rows])
+
+    def _update_cash_balance(self):
+        """Writes the daily running balance to a new sheet after the data sheet
+
+        Header row from the column names, then rows in chunks (see
+        `_write_data_rows()`). Save it to a side file instead (see
+        `utils.write_dataframe_output()`) if it does not fit on a sheet.
+        """
+        if len(self.cash_balance) > MAX_SHEET_ROWS - 1:
+            raise ValueError(
+                f"{len(self.cash_balance)} rows of cash balance do not fit on a sheet,"
+                " write it to a file instead."
+            )
+        self.writer.add_sheet(CASH_BALANCE_SHEET, after=DATA_SHEET)
+        sheet = self.writer.sheet(CASH_BALANCE_SHEET)
+        columns = list(self.cash_balance.columns)
+        self.writer.set_values(
+            sheet.range(f"A1:{get_col_char(len(columns))}1"), [columns]
+        )
+        self._write_data_rows(sheet, self.cash_balance)
 
     def _create_summary_header(
-        self, summary: xw.Sheet, col_index: int, month_year: Tuple[int, int]
+        self, summary: Sheet, col_index: int, month_year: Tuple[int, int]
     ):
         """Creates Month-Year Header in xlwings
 
         Parameters
         ----------
-            summary : xw.Sheet
+            summary : Sheet
                 context of sheet
             col_index : int
                 iteration column's index
@@ -243,9 +523,9 @@ class BudgetApp:
         col = get_col_char(col_index)
 
         ##Hidden references
-        summary.range(f"{col}5").formula = f"=DATE({col}7,{col}6,1)"
-        summary.range(f"{col}6").value = month_year[0]
-        summary.range(f"{col}7").value = month_year[1]
+        self._format_range(summary.range(f"{col}5"), formula=f"=DATE({col}7,{col}6,1)")
+        self._format_range(summary.range(f"{col}6"), value=month_year[0])
+        self._format_range(summary.range(f"{col}7"), value=month_year[1])
 
         ##Title
         title_cell = summary.range(f"{col}9")
@@ -254,15 +534,15 @@ class BudgetApp:
         )
 
         ##Copy header fill cell
-        summary.range(f"D2").copy(summary.range(f"{col}2"))
+        self.writer.copy_range(summary.range(f"D2"), summary.range(f"{col}2"))
 
         ##Check if new year, add for later
         if col_index > 4 and month_year[0] == 1:
-            self.new_year_cols.append(col_index)
+            self._new_year_cols.append(col_index)
 
     def _create_category(
         self,
-        summary: xw.Sheet,
+        summary: Sheet,
         row_index: int,
         max_col_index: int,
         categoryGroup: dict,
@@ -273,13 +553,14 @@ class BudgetApp:
         Gets category data (item data from _get_items()), creates title,
         iterates over each item in Display_Group, writes label cell, sets formula
             SUMIFS -- Budget Amount, based on item_name, month, year
+            (or static totals, see `summary_mode`)
         Adds bottom border to last item in group, total row (sum of all items),
         % of Income if group != income
 
         Parameters
         ----------
-            summary : xw.Sheet
-                _description_
+            summary : Sheet
+                context of sheet
             row_index : int
                 Starting row index for group
             max_col_index : int
@@ -314,15 +595,21 @@ class BudgetApp:
         for _, item in category_data.iterrows():
             item_row += 1
             item_title_cell = summary.range(f"B{item_row}")
-            item_title_cell.value = item["item_name"]
+            self._format_range(item_title_cell, value=item["item_name"])
 
-            # Add formulas for all months
+            # Add formulas (or totals) for all months
             item_rng = summary.range(f"D{item_row}:{max_col_char}{item_row}")
-            self._format_range(
-                item_rng,
-                format=Excel.FormatType.Number,
-                formula=f"=IFERROR(SUMIFS(Data!$T:$T,Data!$H:$H,@$B:$B,Data!$E:$E,D$7,Data!$D:$D,D$6),0)",
-            )
+            if self.summary_mode == Excel.SummaryMode.Values:
+                self.writer.set_values(
+                    item_rng, [self._item_totals.loc[item["item_name"]].tolist()]
+                )
+                self._format_range(item_rng, format=Excel.FormatType.Number)
+            else:
+                self._format_range(
+                    item_rng,
+                    format=Excel.FormatType.Number,
+                    formula=self._get_item_formula(),
+                )
 
         ##For last row in "group" add bottom border
         item_btm_rng = summary.range(f"B{item_row}:{max_col_char}{item_row}")
@@ -331,9 +618,9 @@ class BudgetApp:
         ##Identify total row for group
         total_row = item_row + 1
         if categoryGroup["display_group"] == "Income":
-            self.income_total_row = total_row
+            self._income_total_row = total_row
         else:
-            self.expense_total_rows.append(total_row)
+            self._expense_total_rows.append(total_row)
 
         # Add text to total label
         total_cell = summary.range(f"B{total_row}")
@@ -365,13 +652,13 @@ class BudgetApp:
             pct_rng = summary.range(f"D{pct_row}:{max_col_char}{pct_row}")
             self._format_range(
                 pct_rng,
-                formula=f"=-D{pct_row-1}/D{self.income_total_row}",
+                formula=f"=-D{pct_row-1}/D{self._income_total_row}",
                 format=Excel.FormatType.Percentage,
                 italic=True,
             )
             return pct_row
 
-    def _build_totals(self, summary: xw.Sheet, row_index: int, max_col_index: int):
+    def _build_totals(self, summary: Sheet, row_index: int, max_col_index: int):
         """Builds additional group area to summarize Income, Expenses
 
 
@@ -380,7 +667,7 @@ class BudgetApp:
 
         Parameters
         ----------
-            summary : xw.Sheet
+            summary : Sheet
             row_index : int
                 starting row index
             max_col_index : int
@@ -404,7 +691,7 @@ class BudgetApp:
         income_rng = summary.range(f"D{row_index}:{max_col_char}{row_index}")
         self._format_range(
             income_rng,
-            formula=f"=D{self.income_total_row}",
+            formula=f"=D{self._income_total_row}",
             format=Excel.FormatType.Number,
         )
         row_index += 1
@@ -416,7 +703,7 @@ class BudgetApp:
         self._format_range(
             expense_rng,
             formula="=SUM("
-            + (",".join(f"D{c}" for c in self.expense_total_rows))
+            + (",".join(f"D{c}" for c in self._expense_total_rows))
             + ")",
             format=Excel.FormatType.Number,
         )
@@ -446,7 +733,7 @@ class BudgetApp:
         remaining_pct_rng = summary.range(f"D{row_index}:{max_col_char}{row_index}")
         self._format_range(
             remaining_pct_rng,
-            formula=f"=D{row_index-1}/D{self.income_total_row}",
+            formula=f"=D{row_index-1}/D{self._income_total_row}",
             format=Excel.FormatType.Percentage,
             italic=True,
         )
@@ -454,13 +741,13 @@ class BudgetApp:
         return row_index
 
     def _sheet_level_formatting(
-        self, summary: xw.Sheet, max_col_index: int, last_row_index: int
+        self, summary: Sheet, max_col_index: int, last_row_index: int
     ):
         """Performs minor clean-up & formatting updates to sheet.
 
         Parameters
         ----------
-            summary : xw.Sheet
+            summary : Sheet
             max_col_index : int
                 last col written
             last_row_index : int
@@ -470,11 +757,12 @@ class BudgetApp:
             f"A1:{get_col_char(max_col_index+26)}{last_row_index+1000}"
         )
         self._format_range(all_cells, font_name="Arial", font_size=10)
-        summary.range("B2").characters[0:15].font.size = 16  # reset title font
+        # reset title font
+        self.writer.set_characters_font_size(summary.range("B2"), 0, 15, 16)
 
-        summary.book.app.api.ActiveWindow.Zoom = 80
+        self.writer.set_zoom(summary.name, 80)
 
-        for new_year in self.new_year_cols:
+        for new_year in self._new_year_cols:
             new_year_col = summary.range(
                 f"{get_col_char(new_year)}9:{get_col_char(new_year)}{last_row_index}"
             )
@@ -485,53 +773,72 @@ class BudgetApp:
     def build(self):
         """Wrapper function that calls individual steps of update process.
 
-        Using existing xlwings.Book context, open template, update base budget data,
+        Using the writer, open template, update base budget data,
         edit title, iterate over month_year, create date headers, build display_groups,
         build totals, apply sheet formatting.
+        With the batch writer, writes & styles reach the backend in the flush phase.
 
         """
-        self._create_xlInstance()
-        summary = self.wb.sheets["Template"]
-        summary.activate()
+        stage = self.instrumentation.stage
+        with stage("BudgetApp._open_workbook"):
+            self._open_workbook()
+            summary = self.writer.sheet(TEMPLATE_SHEET)
+            self.writer.activate(summary.name)
 
         ##Update underlying data
-        self._update_data()
+        with stage("BudgetApp._update_data", lambda: len(self.df)):
+            self._update_data()
+        if self.cash_balance is not None:
+            with stage(
+                "BudgetApp._update_cash_balance", lambda: len(self.cash_balance)
+            ):
+                self._update_cash_balance()
 
         ##Edit title
-        summary.range("B2").value = (
-            summary.range("B2")
-            .value.replace("MinDate", self.min_date.strftime("%m/%Y"))
-            .replace("MaxDate", self.max_date.strftime("%m/%Y"))
+        title_cell = summary.range("B2")
+        self._format_range(
+            title_cell,
+            value=self.writer.get_value(title_cell)
+            .replace("MinDate", self.min_date.strftime("%m/%Y"))
+            .replace("MaxDate", self.max_date.strftime("%m/%Y")),
         )
 
         # Loop to create date headers
-        start_col = 3
-        month_years = self._get_unique_months()
-        for month_year in month_years:
-            start_col += 1
-            self._create_summary_header(summary, start_col, month_year)
+        with stage("BudgetApp._create_summary_header", lambda: len(month_years)):
+            start_col = 3
+            month_years = self._get_unique_months()
+            for month_year in month_years:
+                start_col += 1
+                self._create_summary_header(summary, start_col, month_year)
 
         # Iterate over category groups now
-        iter_row = 9
-        category_groups = self._get_category_groups()
-        items = self._get_items()
-        for _, cg in category_groups.iterrows():
-            iter_row += 2
-            iter_row = self._create_category(summary, iter_row, start_col, cg, items)
+        with stage("BudgetApp._create_category", lambda: len(items)):
+            if self.summary_mode == Excel.SummaryMode.Values:
+                self._item_totals = self._get_item_totals(month_years)
+            iter_row = 9
+            category_groups = self._get_category_groups()
+            items = self._get_items()
+            for _, cg in category_groups.iterrows():
+                iter_row += 2
+                iter_row = self._create_category(
+                    summary, iter_row, start_col, cg, items
+                )
 
         # Create totals
-        iter_row += 2
-        iter_row = self._build_totals(summary, iter_row, start_col)
+        with stage("BudgetApp._build_totals"):
+            iter_row += 2
+            iter_row = self._build_totals(summary, iter_row, start_col)
 
         # Sheet-level formatting
-        self._sheet_level_formatting(summary, start_col, iter_row)
+        with stage("BudgetApp._sheet_level_formatting"):
+            self._sheet_level_formatting(summary, start_col, iter_row)
+
+        with stage("BudgetApp.flush"):
+            self.writer.flush()
 
     def save_and_close(self):
-        """Using instance of xlwings.Book, saves & closes file"""
-        self._wb.save(
-            os.path.join(
-                SAVE_PATH, f"Budget Tool {datetime.now().strftime('%Y%m%d')}.xlsx"
-            )
-        )
-        self._wb.close()
-        self._xlApp.kill()
+        """Using the writer, saves & closes file"""
+        with self.instrumentation.stage("BudgetApp.save_and_close"):
+            os.makedirs(self.save_path, exist_ok=True)
+            self.writer.save(self._get_save_path())
+            self.writer.close()
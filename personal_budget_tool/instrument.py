@@ -0,0 +1,197 @@
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Callable, NamedTuple
+
+
+class StageRecord(NamedTuple):
+    """Measurements of one stage, see `Instrumentation.stage()`"""
+
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    rows: int
+    memory_delta: int
+    memory_peak: int
+    depth: int
+
+
+class Instrumentation:
+    """Records wall time, CPU time, row counts & memory of build stages
+
+    Passed to `DataBuilder` & `BudgetApp` (`instrumentation=`), which wrap each
+    step of `build_data_model()` / phase of `build()` in `stage()`. Disabled
+    instrumentation (see `NO_INSTRUMENTATION`) hands out a shared no-op
+    context, so un-instrumented builds only pay for an attribute lookup.
+    Stages may nest (ex. the steps of an incremental build), nested stages are
+    indented in the summary & left out of the total.
+
+    Attributes
+    ----------
+        enabled : bool
+            Whether stages are measured
+        callbacks : list
+            Called with each StageRecord as its stage ends
+        memory : bool
+            Trace allocations (tracemalloc) for memory deltas & peaks
+        records : list
+            StageRecord of each stage, in the order they started
+
+    Methods
+    -------
+        stage(name, rows):
+            Context manager measuring one stage
+        summary():
+            Table of the recorded stages
+        print_summary():
+            Prints the table
+    """
+
+    def __init__(
+        self, enabled: bool = True, callbacks: list = None, memory: bool = True
+    ):
+        """Initializes Instrumentation
+
+        Parameters
+        ----------
+            enabled (bool, optional): bool, default True
+                Measure stages, otherwise `stage()` is a no-op
+            callbacks (list, optional): list, default None
+                Callables taking a StageRecord, called as each stage ends
+                (ex. to log or forward measurements)
+            memory (bool, optional): bool, default True
+                Trace allocations for memory deltas & peaks. tracemalloc slows
+                allocation-heavy stages, turn off for timings only
+        """
+        self.enabled = enabled
+        self.callbacks = list(callbacks or [])
+        self.memory = memory
+        self.records = []
+        self._null_stage = nullcontext()
+        ## Peak traced memory of each open stage, outer first
+        self._open_peaks = []
+
+    def stage(self, name: str, rows: Callable[[], int] = None):
+        """Measures the stage run inside the returned context
+
+        Parameters
+        ----------
+            name : str
+                Stage name, ex. `DataBuilder._get_date_items`
+            rows (Callable[[], int], optional): callable, default None
+                Returns the row count the stage produced, called after it ends
+
+        Returns
+        -------
+            context manager
+        """
+        if not self.enabled:
+            return self._null_stage
+        return self._measure(name, rows)
+
+    @contextmanager
+    def _measure(self, name: str, rows: Callable[[], int]):
+        """Records a StageRecord for the body, see `stage()`"""
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.memory:
+            ## Resetting the peak would lose the enclosing stage's, keep it aside
+            if self._open_peaks:
+                self._open_peaks[-1] = max(
+                    self._open_peaks[-1], tracemalloc.get_traced_memory()[1]
+                )
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        depth = len(self._open_peaks)
+        self._open_peaks.append(0)
+        ## Slot taken on entry, so nested stages are listed after their parent
+        index = len(self.records)
+        self.records.append(None)
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        except BaseException:
+            del self.records[index]
+            raise
+        finally:
+            wall_seconds = time.perf_counter() - start_wall
+            cpu_seconds = time.process_time() - start_cpu
+            memory_delta = memory_peak = None
+            peak = self._open_peaks.pop()
+            if self.memory:
+                current, traced_peak = tracemalloc.get_traced_memory()
+                peak = max(peak, traced_peak)
+                memory_delta = current - start_memory
+                memory_peak = peak - start_memory
+                if self._open_peaks:
+                    self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+            if started_tracing:
+                tracemalloc.stop()
+
+        record = StageRecord(
+            name,
+            wall_seconds,
+            cpu_seconds,
+            rows() if rows else None,
+            memory_delta,
+            memory_peak,
+            depth,
+        )
+        self.records[index] = record
+        for callback in self.callbacks:
+            callback(record)
+
+    def summary(self) -> str:
+        """Table of the recorded stages, in the order they started
+
+        Returns
+        -------
+            str
+        """
+        if not self.records:
+            return "No stages recorded."
+
+        def fmt_mb(value: int) -> str:
+            return "" if value is None else f"{value / 2**20:.1f}"
+
+        header = ("stage", "wall ms", "cpu ms", "rows", "mem delta MB", "peak MB")
+        rows = [
+            (
+                "  " * record.depth + record.name,
+                f"{record.wall_seconds * 1000:.1f}",
+                f"{record.cpu_seconds * 1000:.1f}",
+                "" if record.rows is None else f"{record.rows:,}",
+                fmt_mb(record.memory_delta),
+                fmt_mb(record.memory_peak),
+            )
+            for record in self.records
+        ]
+        top_level = [record for record in self.records if record.depth == 0]
+        rows.append(
+            (
+                "total",
+                f"{sum(r.wall_seconds for r in top_level) * 1000:.1f}",
+                f"{sum(r.cpu_seconds for r in top_level) * 1000:.1f}",
+                "",
+                "",
+                "",
+            )
+        )
+        widths = [max(len(row[i]) for row in [header, *rows]) for i in range(6)]
+        lines = [
+            "  ".join(
+                value.ljust(width) if i == 0 else value.rjust(width)
+                for i, (value, width) in enumerate(zip(row, widths))
+            )
+            for row in [header, *rows]
+        ]
+        return "\n".join(lines)
+
+    def print_summary(self):
+        """Prints the table of recorded stages, see `summary()`"""
+        print(self.summary())
+
+
+NO_INSTRUMENTATION = Instrumentation(enabled=False)
@@ -0,0 +1,225 @@
+import numpy as np
+from functools import lru_cache
+
+## Frequency codes of the kernel, see `DataBuilder._get_item_params()`
+UNKNOWN = -1
+DAILY = 0
+WEEKLY = 1
+MONTHLY = 2
+DATED = 3
+STRIDE_DAYS = 4
+STRIDE_MONTHS = 5
+
+## Missing dates (start_date, end_date, frequency_date) in ordinal arrays
+MISSING = np.iinfo(np.int64).min
+
+CALENDAR_ARRAYS = [
+    "ordinal",
+    "day_of_week",
+    "day_number",
+    "month_index",
+    "last_day",
+    "seasonality",
+]
+ITEM_ARRAYS = [
+    "is_active",
+    "code",
+    "step",
+    "day",
+    "date_ordinal",
+    "start_ordinal",
+    "end_ordinal",
+    "start_month_index",
+    "start_day",
+    "amount",
+    "is_seasonality",
+]
+
+
+def _budget_amounts_loop(
+    item_pos,
+    date_pos,
+    ordinal,
+    day_of_week,
+    day_number,
+    month_index,
+    last_day,
+    seasonality,
+    is_active,
+    code,
+    step,
+    day,
+    date_ordinal,
+    start_ordinal,
+    end_ordinal,
+    start_month_index,
+    start_day,
+    amount,
+    is_seasonality,
+    amounts,
+    occurs,
+):
+    """Fills amounts & occurs row by row, compiled by numba if installed"""
+    for i in range(len(item_pos)):
+        it = item_pos[i]
+        d = date_pos[i]
+        date = ordinal[d]
+        start = start_ordinal[it]
+        end = end_ordinal[it]
+        if not is_active[it]:
+            continue
+        if (start != MISSING and date < start) or (end != MISSING and date > end):
+            continue
+
+        frequency = code[it]
+        if frequency == DAILY:
+            hit = True
+        elif frequency == WEEKLY:
+            hit = day_of_week[d] == (1.0 if np.isnan(day[it]) else day[it])
+        elif frequency == MONTHLY:
+            hit = not np.isnan(day[it]) and day_number[d] == min(day[it], last_day[d])
+        elif frequency == DATED:
+            hit = date == date_ordinal[it]
+        elif frequency == STRIDE_DAYS:
+            hit = start != MISSING and step[it] > 0 and (date - start) % step[it] == 0
+        elif frequency == STRIDE_MONTHS:
+            hit = (
+                start != MISSING
+                and step[it] > 0
+                and (month_index[d] - start_month_index[it]) % step[it] == 0
+                and day_number[d] == min(start_day[it], last_day[d])
+            )
+        else:
+            hit = False
+
+        if hit:
+            occurs[i] = True
+            amounts[i] = amount[it] * (seasonality[d] if is_seasonality[it] else 1.0)
+
+
+def _budget_amounts_numpy(
+    item_pos,
+    date_pos,
+    ordinal,
+    day_of_week,
+    day_number,
+    month_index,
+    last_day,
+    seasonality,
+    is_active,
+    code,
+    step,
+    day,
+    date_ordinal,
+    start_ordinal,
+    end_ordinal,
+    start_month_index,
+    start_day,
+    amount,
+    is_seasonality,
+    amounts,
+    occurs,
+):
+    """Vectorized equivalent of `_budget_amounts_loop()`, without numba"""
+    date = ordinal[date_pos]
+    start = start_ordinal[item_pos]
+    end = end_ordinal[item_pos]
+    frequency = code[item_pos]
+    item_day = day[item_pos]
+    item_step = np.maximum(step[item_pos], 1)
+    row_day = day_number[date_pos]
+    row_last_day = last_day[date_pos]
+    has_start = start != MISSING
+
+    is_valid = is_active[item_pos]
+    is_valid &= ~has_start | (date >= start)
+    is_valid &= (end == MISSING) | (date <= end)
+
+    hit = frequency == DAILY
+    hit |= (frequency == WEEKLY) & (
+        day_of_week[date_pos] == np.where(np.isnan(item_day), 1.0, item_day)
+    )
+    hit |= (frequency == MONTHLY) & (row_day == np.minimum(item_day, row_last_day))
+    hit |= (frequency == DATED) & (date == date_ordinal[item_pos])
+    is_stepped = has_start & (step[item_pos] > 0)
+    hit |= (
+        is_stepped
+        & (frequency == STRIDE_DAYS)
+        & ((date - np.where(has_start, start, 0)) % item_step == 0)
+    )
+    hit |= (
+        is_stepped
+        & (frequency == STRIDE_MONTHS)
+        & ((month_index[date_pos] - start_month_index[item_pos]) % item_step == 0)
+        & (row_day == np.minimum(start_day[item_pos], row_last_day))
+    )
+
+    occurs[:] = is_valid & hit
+    multiplier = np.where(is_seasonality[item_pos], seasonality[date_pos], 1.0)
+    amounts[:] = np.where(occurs, amount[item_pos] * multiplier, 0.0)
+
+
+@lru_cache(maxsize=None)
+def _get_jit_loop():
+    """`_budget_amounts_loop()` compiled with numba, None if not installed"""
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(cache=True, nogil=True)(_budget_amounts_loop)
+
+
+def budget_amounts(
+    item_pos: np.ndarray,
+    date_pos: np.ndarray,
+    calendar: dict,
+    items: dict,
+    jit: bool = True,
+):
+    """Applies the frequency rules to every (item, date) row
+
+    Works on integer date ordinals (days since epoch) & per-item parameter
+    arrays, rather than on the date_items frame. Row i is the item at
+    item_pos[i] on the calendar date at date_pos[i]:
+        valid if the item is active & date is within start/end ordinals
+        DAILY -> every date
+        WEEKLY -> day_of_week == day (1 if missing)
+        MONTHLY -> day_number == day, moved to last_day in shorter months
+        DATED -> ordinal == date_ordinal
+        STRIDE_DAYS -> every step days from start_ordinal
+        STRIDE_MONTHS -> every step months from start_month_index, on
+            start_day (or last_day)
+    Occurring rows get amount * seasonality (if is_seasonality), others 0.00.
+
+    Parameters
+    ----------
+        item_pos : np.ndarray
+            position of each row's item in the item arrays
+        date_pos : np.ndarray
+            position of each row's date in the calendar arrays
+        calendar : dict
+            CALENDAR_ARRAYS -> np.ndarray, one value per calendar date
+            (last_day is the number of days in the date's month)
+        items : dict
+            ITEM_ARRAYS -> np.ndarray, one value per item
+        jit (bool, optional): bool, default True
+            Run the loop compiled with numba when installed, otherwise (or if
+            False) the vectorized NumPy version
+
+    Returns
+    -------
+        Tuple[np.ndarray, np.ndarray]
+            budget amount (float64) & occurs (bool) of each row
+    """
+    amounts = np.zeros(len(item_pos), dtype=np.float64)
+    occurs = np.zeros(len(item_pos), dtype=np.bool_)
+    kernel = (_get_jit_loop() if jit else None) or _budget_amounts_numpy
+    kernel(
+        np.asarray(item_pos, dtype=np.int64),
+        np.asarray(date_pos, dtype=np.int64),
+        *[calendar[name] for name in CALENDAR_ARRAYS],
+        *[items[name] for name in ITEM_ARRAYS],
+        amounts,
+        occurs,
+    )
+    return amounts, occurs
@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+
+from constants import Models
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+## Sampled values held in memory at once (paths x rows/days), ~64 MB of float64
+MAX_CHUNK_VALUES = 2**23
+
+
+def _sample_factors(rng: np.random.Generator, spec: dict, size: tuple) -> np.ndarray:
+    """Samples multipliers of budget amounts, mean 1.00
+
+    Parameters
+    ----------
+        rng : np.random.Generator
+        spec : dict
+            distribution & its parameters, see `simulate_budget()`
+        size : tuple
+            (paths, rows)
+
+    Returns
+    -------
+        np.ndarray
+    """
+    distribution = spec["distribution"]
+    if distribution == "normal":
+        return rng.normal(1.00, spec["std"], size)
+    if distribution == "lognormal":
+        sigma = spec["sigma"]
+        return rng.lognormal(-(sigma**2) / 2, sigma, size)
+    if distribution == "uniform":
+        return rng.uniform(spec["low"], spec["high"], size)
+    raise ValueError(
+        f"Unknown distribution {distribution}, "
+        "expected one of ['normal', 'lognormal', 'uniform']"
+    )
+
+
+def _get_rules(df: pd.DataFrame, variability: list) -> np.ndarray:
+    """Index of the variability rule applied to each row, -1 if fixed
+
+    Rows match a rule if they match all its `where` fields, later rules take
+    precedence (as scenario overrides do, see `batch.apply_scenario()`).
+    """
+    rules = np.full(len(df), -1)
+    for i, spec in enumerate(variability):
+        is_match = np.ones(len(df), dtype=bool)
+        for col, value in spec.get("where", {}).items():
+            values = value if isinstance(value, list) else [value]
+            is_match &= df[col].isin(values).to_numpy()
+        rules[is_match] = i
+    return rules
+
+
+def simulate_budget(
+    df: pd.DataFrame,
+    variability: list,
+    n_paths: int = 10000,
+    opening_balance: float = 0.00,
+    percentiles: list = None,
+    seed: int = None,
+) -> dict:
+    """Simulates budget paths with variable item amounts
+
+    Every occurrence of a matching item gets its own multiplier per path, so
+    each path is one possible outcome of the budget. Only arrays are built:
+    for a chunk of paths, multipliers are sampled as (paths x rows), summed
+    into (paths x days) with `np.add.reduceat` over the date-ordered rows, then
+    reduced to monthly totals & ending balance. Fixed items are summed per day
+    once & shared by every path.
+
+    Variability format:
+        [
+            {
+                "where": {"display_group": "Food & Dining"},
+                "distribution": "normal",
+                "std": 0.15,
+            },
+            {
+                "where": {"item_name": ["Electric", "Gas"]},
+                "distribution": "lognormal",
+                "sigma": 0.25,
+            },
+            {
+                "where": {"item_name": "Dining Out"},
+                "distribution": "uniform",
+                "low": 0.75,
+                "high": 1.40,
+            },
+        ]
+    Multipliers have a mean of 1.00 (uniform: (low + high) / 2), applied on
+    top of seasonality. Items matching no rule keep their budgeted amount.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            Data df from the `DataBuilder` class
+        variability : list
+            rules, see above
+        n_paths (int, optional): int, default 10000
+            number of simulated budgets
+        opening_balance (float, optional): float, default 0.00
+            balance before the first date
+        percentiles (list, optional): list, default PERCENTILES
+            percentile bands to report
+        seed (int, optional): int, default None
+            random seed, same seed gives the same results
+
+    Returns
+    -------
+        dict
+            monthly - pd.DataFrame, Index: (month_number, year),
+                Columns: budget (no variability), mean & p<percentile>
+            ending_balance - pd.Series, same labels as monthly columns
+    """
+    percentiles = percentiles or PERCENTILES
+    date_col = Models.BudgetDate.IndexColumn
+    df = df[df["budget_item_amount"] != 0].sort_values(date_col, kind="stable")
+    if not len(df):
+        raise ValueError("No budget amounts to simulate.")
+    amounts = df["budget_item_amount"].to_numpy(np.float64)
+    rules = _get_rules(df, variability)
+    is_variable = rules >= 0
+
+    ## Days with any amount, & the first day of each month among them
+    date_ids = df[date_col].to_numpy()
+    days, day_starts = np.unique(date_ids, return_index=True)
+    years = df["year"].to_numpy(np.int64)
+    day_months = (years * 100 + df["month_number"].to_numpy(np.int64))[day_starts]
+    months, month_starts = np.unique(day_months, return_index=True)
+    fixed_daily = np.add.reduceat(np.where(is_variable, 0.00, amounts), day_starts)
+
+    ## Variable rows, positions of their days & of each rule's rows
+    variable_amounts = amounts[is_variable]
+    variable_rules = rules[is_variable]
+    variable_days, variable_starts = np.unique(
+        np.searchsorted(days, date_ids[is_variable]), return_index=True
+    )
+    rule_rows = [
+        (spec, np.flatnonzero(variable_rules == i))
+        for i, spec in enumerate(variability)
+    ]
+
+    rng = np.random.default_rng(seed)
+    monthly = np.empty((n_paths, len(months)))
+    ending_balance = np.empty(n_paths)
+    chunk_paths = max(1, MAX_CHUNK_VALUES // max(len(variable_amounts), len(days), 1))
+    for start in range(0, n_paths, chunk_paths):
+        paths = min(chunk_paths, n_paths - start)
+        daily = np.tile(fixed_daily, (paths, 1))
+        if len(variable_amounts):
+            factors = np.empty((paths, len(variable_amounts)))
+            for spec, rows in rule_rows:
+                factors[:, rows] = _sample_factors(rng, spec, (paths, len(rows)))
+            factors *= variable_amounts
+            daily[:, variable_days] += np.add.reduceat(
+                factors, variable_starts, axis=1
+            )
+        monthly[start : start + paths] = np.add.reduceat(daily, month_starts, axis=1)
+        ending_balance[start : start + paths] = opening_balance + daily.sum(axis=1)
+
+    def bands(values: np.ndarray, budget) -> dict:
+        return {
+            "budget": budget,
+            "mean": values.mean(axis=0),
+            **{
+                f"p{q}": band
+                for q, band in zip(percentiles, np.percentile(values, percentiles, 0))
+            },
+        }
+
+    budget_monthly = np.add.reduceat(
+        np.add.reduceat(amounts, day_starts), month_starts
+    )
+    return {
+        "monthly": pd.DataFrame(
+            bands(monthly, budget_monthly),
+            index=pd.MultiIndex.from_arrays(
+                [months % 100, months // 100], names=["month_number", "year"]
+            ),
+        ),
+        "ending_balance": pd.Series(
+            bands(ending_balance, opening_balance + amounts.sum()),
+            name="ending_balance",
+        ),
+    }
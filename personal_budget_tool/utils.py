@@ -1,5 +1,139 @@
+import glob
+import hashlib
 import itertools
+import json
+import os
+import re
+import numpy as np
 import pandas as pd
+from typing import Tuple
+
+from constants import Defaults
+from constants import DotDict  # noqa: F401, kept importable from utils
+
+## A1-style cell (ex. `$D4`) & column range (ex. `$T:$T`) references in formulas
+CELL_REF = re.compile(r"(?<![\w$])(\$?)([A-Z]{1,3})(\$?)(\d+)(?![\w(])")
+COL_RANGE_REF = re.compile(r"(?<![\w$])(\$?)([A-Z]{1,3}):(\$?)([A-Z]{1,3})(?![\w(])")
+## Implicit intersection operator, a leading `@` on a reference or function name
+## (ex. `=@$B:$B`), matched along with quoted text & sheet names to skip them
+IMPLICIT_INTERSECTION = re.compile(
+    r"(\"[^\"]*\"|'[^']*')|(?<![\w.!\[\]])@(?=[$A-Za-z_'])"
+)
+
+
+def get_file_hash(path: str) -> str:
+    """Hashes the contents of a local file
+
+    Parameters
+    ----------
+        path : str
+            path to file
+
+    Returns
+    -------
+        str
+            sha256 hex digest
+    """
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_df_hash(df: pd.DataFrame) -> str:
+    """Hashes the contents of a dataframe, including index & row order
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+
+    Returns
+    -------
+        str
+            sha256 hex digest
+    """
+    df_hash = hashlib.sha256(str(list(df.columns)).encode())
+    df_hash.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return df_hash.hexdigest()
+
+
+def _get_input_cache_path(cache_dir: str, Source: dict, model: dict) -> str:
+    """Builds cache file path for a parsed input
+
+    Key combines workbook contents, read_excel parameters (sheet_name, usecols..),
+    the model definition & pandas version, so any change results in a new file.
+    File name is `<sheet>-<workbook>-<key>`, workbook a hash of the workbook's
+    path, so workbooks sharing cache_dir keep their own entries.
+
+    Parameters
+    ----------
+        cache_dir : str
+            directory of cache files
+        Source : dict
+            pandas.read_excel parameters
+        model : dict
+            Columns, IndexColumn, BoolColumns
+
+    Returns
+    -------
+        str
+            path to cache file, w/o extension
+    """
+    params = {k: v for k, v in Source.items() if k != "io"}
+    key = json.dumps(
+        [get_file_hash(Source["io"]), params, model, pd.__version__],
+        sort_keys=True,
+        default=str,
+    )
+    sheet = str(Source.get("sheet_name", 0)).replace(" ", "_")
+    workbook = hashlib.sha256(os.path.abspath(Source["io"]).encode()).hexdigest()[:8]
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{sheet}-{workbook}-{digest}")
+
+
+def _read_parquet_cache(path: str) -> pd.DataFrame:
+    """Reads a Parquet cached input, with missing values as read_excel gives them
+
+    Parquet reads missing values of object columns back as None, read_excel
+    (and the pickle cache) give NaN.
+    """
+    df = pd.read_parquet(path)
+    for col in df.select_dtypes("object").columns:
+        df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def _read_input_cache(cache_path: str) -> pd.DataFrame:
+    """Reads a cached input (see `read_dataframe_input()`), None if missing"""
+    if os.path.exists(cache_path + ".parquet"):
+        return _read_parquet_cache(cache_path + ".parquet")
+    if os.path.exists(cache_path + ".pkl"):
+        return pd.read_pickle(cache_path + ".pkl")
+    return None
+
+
+def _write_input_cache(cache_path: str, df: pd.DataFrame):
+    """Writes a cached input, replacing stale entries for the same sheet & workbook
+
+    Stored as Parquet when pyarrow is installed & the frame reads back
+    unchanged, otherwise as a pickle. Ex. object columns mixing numbers & text
+    (ArrowTypeError / ArrowInvalid) or dtypes Parquet does not keep.
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    sheet_prefix = cache_path.rsplit("-", 1)[0]
+    for stale_path in glob.glob(glob.escape(sheet_prefix) + "-*"):
+        os.remove(stale_path)
+    parquet_path = cache_path + ".parquet"
+    try:
+        df.to_parquet(parquet_path, index=False)
+        if _read_parquet_cache(parquet_path).equals(df):
+            return
+    except (ImportError, TypeError, ValueError):
+        pass
+    if os.path.exists(parquet_path):
+        os.remove(parquet_path)
+    df.to_pickle(cache_path + ".pkl")
 
 
 def read_dataframe_input(
@@ -7,6 +141,7 @@ def read_dataframe_input(
     Columns: list = None,
     IndexColumn: str = None,
     BoolColumns: list = None,
+    cache_dir: str = None,
 ) -> pd.DataFrame:
     """Fetches a dataframe from a local Excel file.
 
@@ -20,11 +155,26 @@ def read_dataframe_input(
             str name of index column to be created based on ID
         BoolColumns (list, optional): list, default None
             list of str columns to be converted to boolean from Y/N text options in Excel
+        cache_dir (str, optional): str, default None
+            directory to cache the parsed dataframe in, re-used while the Excel
+            file, Source params & model are unchanged. No caching if None
 
     Returns
     -------
         pd.DataFrame
     """
+    cache_path = None
+    if cache_dir and isinstance(Source["io"], (str, os.PathLike)):
+        model = {
+            "Columns": Columns,
+            "IndexColumn": IndexColumn,
+            "BoolColumns": BoolColumns,
+        }
+        cache_path = _get_input_cache_path(cache_dir, Source, model)
+        df = _read_input_cache(cache_path)
+        if df is not None:
+            return df
+
     df = pd.read_excel(**Source)
     if Columns:
         df.columns = Columns
@@ -34,40 +184,123 @@ def read_dataframe_input(
         for bool_col in BoolColumns:
             df[bool_col] = df[bool_col].apply(lambda x: True if x == "Y" else False)
 
+    if cache_path:
+        _write_input_cache(cache_path, df)
+
     return df
 
 
-def filter_df_between(
-    df: pd.DataFrame, col: str, vals: tuple, index_col: str = None
-) -> pd.DataFrame:
-    """Filters a dataframe based on a single key and two inclusive boundaries
+def get_data_format(path: str, data_format: str = None) -> str:
+    """Resolves the export format of a budget detail file or directory
+
+    Parameters
+    ----------
+        path : str
+            file (format taken from the extension) or partitioned directory
+        data_format (str, optional): str, default None
+            see `Defaults.DataFormats`, inferred from path if None
+
+    Returns
+    -------
+        str
+            one of `Defaults.DataFormats`
+    """
+    if data_format is None:
+        extension = os.path.splitext(path)[1].lstrip(".").lower()
+        data_format = {"feather": "arrow", "ipc": "arrow"}.get(extension, extension)
+    if data_format not in Defaults.DataFormats.values():
+        raise ValueError(
+            f"Unknown data format for {path}, "
+            f"expected one of {list(Defaults.DataFormats.values())}"
+        )
+    return data_format
+
+
+def write_dataframe_output(
+    df: pd.DataFrame,
+    path: str,
+    data_format: str = None,
+    partition_cols: list = None,
+) -> str:
+    """Writes a dataframe to a CSV, Parquet or Arrow IPC (Feather v2) file
+
+    Partitioned output is a directory of `<col>=<value>` sub-directories (hive
+    layout, readable by pyarrow/Spark/DuckDB), the partition columns are stored
+    in the directory names rather than the files. Requires pyarrow, as do
+    Parquet & Arrow files.
 
     Parameters
     ----------
         df : pd.DataFrame
-            The dataframe to be filtered
-        col : str
-            The key to filter on
-        vals : tuple
-            (min_value, max_value)
-        index_col (str, optional): str, default None
-            Re-create ID (index) column based on index, name str
+        path : str
+            file, or directory if partition_cols are given (replaced if it exists)
+        data_format (str, optional): str, default None
+            see `get_data_format()`
+        partition_cols (list, optional): list, default None
+            columns to partition by, ex. ["year"]
 
     Returns
     -------
-        pd.DataFrame
-            filtered dataframe
+        str
+            path written to
     """
-    df = df[(df[col] >= vals[0]) & (df[col] <= vals[1])].reset_index(drop=True)
-    if index_col:
-        df[index_col] = df.index + 1
-    return df
+    data_format = get_data_format(path, data_format)
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if partition_cols:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        ds.write_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            path,
+            format="ipc" if data_format == Defaults.DataFormats.Arrow else data_format,
+            partitioning=partition_cols,
+            partitioning_flavor="hive",
+            existing_data_behavior="delete_matching",
+        )
+    elif data_format == Defaults.DataFormats.Csv:
+        df.to_csv(path, index=False)
+    elif data_format == Defaults.DataFormats.Parquet:
+        df.to_parquet(path, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(path)
+    return path
 
 
-class DotDict(dict):
-    __getattr__ = dict.get
-    __setattr__ = dict.__setitem__
-    __delattr__ = dict.__delitem__
+def read_dataframe_output(
+    path: str, data_format: str = None, memory_map: bool = True
+) -> pd.DataFrame:
+    """Reads back a file or directory from `write_dataframe_output()`
+
+    Read through pyarrow. Arrow IPC files are memory-mapped, so columns are
+    backed by the page cache rather than copied in up front.
+
+    Parameters
+    ----------
+        path : str
+            file, or partitioned directory
+        data_format (str, optional): str, default None
+            see `get_data_format()`, required for partitioned directories
+        memory_map (bool, optional): bool, default True
+            memory-map the files rather than reading them into buffers
+
+    Returns
+    -------
+        pd.DataFrame
+    """
+    import pyarrow.dataset as ds
+    from pyarrow.fs import LocalFileSystem
+
+    data_format = get_data_format(path, data_format)
+    dataset = ds.dataset(
+        os.path.abspath(path),
+        format="ipc" if data_format == Defaults.DataFormats.Arrow else data_format,
+        partitioning="hive" if os.path.isdir(path) else None,
+        filesystem=LocalFileSystem(use_mmap=memory_map),
+    )
+    return dataset.to_table().to_pandas()
 
 
 def get_col_char(i: int) -> str:
@@ -88,3 +321,129 @@ def get_col_char(i: int) -> str:
         i, remainder = divmod(i - 1, 26)
         string = chr(65 + remainder) + string
     return string
+
+
+def get_col_index(col: str) -> int:
+    """Converts an Excel Column (char) to the corresponding integer index
+
+    Parameters
+    ----------
+        col : str
+            Excel column, ex. `AB`
+
+    Returns
+    -------
+        int
+            index of column
+    """
+    i = 0
+    for char in col.upper():
+        i = i * 26 + ord(char) - 64
+    return i
+
+
+def get_range_bounds(address: str) -> Tuple[int, int, int, int]:
+    """Converts an Excel range address to row & column indexes
+
+    Parameters
+    ----------
+        address : str
+            Excel range, ex. `B2` or `D11:H11` ($ is ignored)
+
+    Returns
+    -------
+        Tuple[int, int, int, int]
+            min_row, min_col, max_row, max_col
+    """
+    bounds = []
+    for cell in address.replace("$", "").split(":"):
+        match = CELL_REF.fullmatch(cell)
+        bounds.append((int(match.group(4)), get_col_index(match.group(2))))
+    (min_row, min_col), (max_row, max_col) = bounds[0], bounds[-1]
+    return (min_row, min_col, max_row, max_col)
+
+
+def get_range_address(min_row: int, min_col: int, max_row: int, max_col: int) -> str:
+    """Converts row & column indexes to an Excel range address
+
+    Parameters
+    ----------
+        min_row : int
+        min_col : int
+        max_row : int
+        max_col : int
+
+    Returns
+    -------
+        str
+            Excel range, ex. `D11:H11`, or `B2` for a single cell
+    """
+    address = f"{get_col_char(min_col)}{min_row}"
+    if (min_row, min_col) != (max_row, max_col):
+        address += f":{get_col_char(max_col)}{max_row}"
+    return address
+
+
+def shift_formula(formula: str, rows: int, cols: int) -> str:
+    """Shifts relative references in a formula, as Excel does when filling a range
+
+    Ex. `=SUM(D4,$B4,D$6)` shifted by 0 rows, 1 col is `=SUM(E4,$B4,E$6)`
+    References with `$` are kept, text in quotes is left as-is.
+
+    Parameters
+    ----------
+        formula : str
+            A1-style formula
+        rows : int
+            rows to shift by
+        cols : int
+            columns to shift by
+
+    Returns
+    -------
+        str
+            shifted formula
+    """
+    if not rows and not cols:
+        return formula
+
+    def shift_col(absolute: str, col: str) -> str:
+        return col if absolute else get_col_char(get_col_index(col) + cols)
+
+    def shift_cell(match: re.Match) -> str:
+        col_abs, col, row_abs, row = match.groups()
+        row = row if row_abs else str(int(row) + rows)
+        return f"{col_abs}{shift_col(col_abs, col)}{row_abs}{row}"
+
+    def shift_col_range(match: re.Match) -> str:
+        first_abs, first, last_abs, last = match.groups()
+        return (
+            f"{first_abs}{shift_col(first_abs, first)}:"
+            f"{last_abs}{shift_col(last_abs, last)}"
+        )
+
+    parts = formula.split('"')
+    for i in range(0, len(parts), 2):
+        parts[i] = COL_RANGE_REF.sub(shift_col_range, parts[i])
+        parts[i] = CELL_REF.sub(shift_cell, parts[i])
+    return '"'.join(parts)
+
+
+def strip_implicit_intersection(formula: str) -> str:
+    """Removes the implicit intersection operator (`@`) from a formula
+
+    Only a leading `@` on a reference or function name is removed, an `@` in
+    text (ex. `"a@b.com"`), a quoted sheet name or a structured reference
+    (ex. `[@Col]`) is kept.
+
+    Parameters
+    ----------
+        formula : str
+            A1-style formula
+
+    Returns
+    -------
+        str
+            formula without implicit intersection
+    """
+    return IMPLICIT_INTERSECTION.sub(lambda match: match.group(1) or "", formula)
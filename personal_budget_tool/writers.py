@@ -0,0 +1,810 @@
+import pandas as pd
+from abc import ABC, abstractmethod
+from copy import copy
+from typing import NamedTuple, Union
+
+from constants import Excel
+from utils import (
+    get_range_address,
+    get_range_bounds,
+    shift_formula,
+    strip_implicit_intersection,
+)
+
+
+class SheetRange(NamedTuple):
+    """Address of a range within a named sheet, ex. `SheetRange("Data", "A2")`"""
+
+    sheet: str
+    address: str
+
+
+class Sheet:
+    """Named sheet handle, creates `SheetRange` in the style of xlwings"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def range(self, address: str) -> SheetRange:
+        return SheetRange(self.name, address)
+
+
+class BaseWriter(ABC):
+    """Interface for the backends `BudgetApp` writes workbooks with
+
+    Backends must implement every method but `sheet()` & `flush()`, a backend
+    missing one fails when it is created rather than partway through a build.
+
+    Methods
+    -------
+        open(path):
+            Opens template workbook
+        sheet(name):
+            Returns sheet handle
+        add_sheet(name, after):
+            Adds an empty sheet after another
+        get_last_row(sheet):
+            Index of last row in use on sheet
+        activate(sheet):
+            Brings sheet to front
+        get_value(rng):
+            Gets value of first cell in range
+        set_value(rng, value):
+            Sets cell value(s)
+        set_formula(rng, formula):
+            Sets formula, relative to the top-left cell, for all cells in range
+        set_values(rng, rows):
+            Sets 2-D list of values, one per cell in range
+        set_formulas(rng, rows):
+            Sets 2-D list of formulas, one per cell in range
+        set_format(rng, ...):
+            Sets number format & font properties
+        set_border(rng, border_pos, line_style, border_weight):
+            Adds border to edge of range
+        set_characters_font_size(rng, start, stop, size):
+            Sets font size for part of a cell's text
+        copy_range(src, dst):
+            Copies values & formatting
+        clear_contents(rng):
+            Clears values, keeps formatting
+        write_frame(rng, df):
+            Writes df (w/o index or header) from top-left of range
+        set_zoom(sheet, zoom):
+            Sets sheet zoom %
+        flush():
+            Sends any pending writes to the workbook
+        save(path):
+            Saves workbook
+        close():
+            Closes workbook (and process, if any)
+    """
+
+    @abstractmethod
+    def open(self, path: str):
+        raise NotImplementedError
+
+    def sheet(self, name: str) -> Sheet:
+        return Sheet(name)
+
+    @abstractmethod
+    def add_sheet(self, name: str, after: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_last_row(self, sheet: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def activate(self, sheet: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_value(self, rng: SheetRange):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_value(self, rng: SheetRange, value):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_formula(self, rng: SheetRange, formula: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_values(self, rng: SheetRange, rows: list):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_formulas(self, rng: SheetRange, rows: list):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_format(
+        self,
+        rng: SheetRange,
+        number_format: str = None,
+        font_size: int = None,
+        font_name: str = None,
+        bold: bool = False,
+        italic: bool = False,
+        underline: bool = False,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_border(
+        self,
+        rng: SheetRange,
+        border_pos: int,
+        line_style: int,
+        border_weight: int,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_characters_font_size(
+        self, rng: SheetRange, start: int, stop: int, size: int
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def copy_range(self, src: SheetRange, dst: SheetRange):
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear_contents(self, rng: SheetRange):
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_frame(self, rng: SheetRange, df: pd.DataFrame):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_zoom(self, sheet: str, zoom: int):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    @abstractmethod
+    def save(self, path: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self):
+        raise NotImplementedError
+
+
+class XlwingsWriter(BaseWriter):
+    """Writes workbooks through a live Excel instance using xlwings
+
+    Attributes
+    ----------
+        book : xlwings.Book
+            Instance of the workbook, see `open()`
+    """
+
+    def __init__(self):
+        self.book = None
+
+    def _range(self, rng: SheetRange):
+        return self.book.sheets[rng.sheet].range(rng.address)
+
+    def open(self, path: str):
+        import xlwings as xw
+
+        self.book = xw.Book(path)
+        self.book.app.activate(steal_focus=True)
+
+    def add_sheet(self, name: str, after: str):
+        self.book.sheets.add(name, after=self.book.sheets[after])
+
+    def get_last_row(self, sheet: str) -> int:
+        return self.book.sheets[sheet].used_range.last_cell.row
+
+    def activate(self, sheet: str):
+        self.book.sheets[sheet].activate()
+
+    def get_value(self, rng: SheetRange):
+        return self._range(rng)[0, 0].value
+
+    def set_value(self, rng: SheetRange, value):
+        self._range(rng).value = value
+
+    def set_formula(self, rng: SheetRange, formula: str):
+        self._range(rng).formula = formula
+
+    def set_values(self, rng: SheetRange, rows: list):
+        self._range(rng).value = rows
+
+    def set_formulas(self, rng: SheetRange, rows: list):
+        self._range(rng).formula = rows
+
+    def set_format(
+        self,
+        rng: SheetRange,
+        number_format: str = None,
+        font_size: int = None,
+        font_name: str = None,
+        bold: bool = False,
+        italic: bool = False,
+        underline: bool = False,
+    ):
+        range = self._range(rng)
+        if number_format:
+            range.number_format = number_format
+        if font_size:
+            range.font.size = font_size
+        if font_name:
+            range.font.name = font_name
+        if bold:
+            range.font.bold = True
+        if italic:
+            range.font.italic = True
+        if underline:
+            range.api.Font.Underline = 2
+
+    def set_border(
+        self,
+        rng: SheetRange,
+        border_pos: int,
+        line_style: int,
+        border_weight: int,
+    ):
+        range = self._range(rng)
+        range.api.Borders(border_pos).LineStyle = line_style
+        range.api.Borders(border_pos).Weight = border_weight
+
+    def set_characters_font_size(
+        self, rng: SheetRange, start: int, stop: int, size: int
+    ):
+        self._range(rng).characters[start:stop].font.size = size
+
+    def copy_range(self, src: SheetRange, dst: SheetRange):
+        self._range(src).copy(self._range(dst))
+
+    def clear_contents(self, rng: SheetRange):
+        self._range(rng).clear_contents()
+
+    def write_frame(self, rng: SheetRange, df: pd.DataFrame):
+        self._range(rng).options(index=False, header=False).value = df
+
+    def set_zoom(self, sheet: str, zoom: int):
+        self.book.app.api.ActiveWindow.Zoom = zoom
+
+    def save(self, path: str):
+        self.book.save(path)
+
+    def close(self):
+        app = self.book.app
+        self.book.close()
+        app.kill()
+
+
+class OpenpyxlWriter(BaseWriter):
+    """Writes .xlsx files directly using openpyxl, no Excel process required
+
+    Formulas are stored as-is, Excel calculates them when the file is opened.
+
+    Attributes
+    ----------
+        book : openpyxl.Workbook
+            Instance of the workbook, see `open()`
+    """
+
+    BorderSides = {
+        Excel.BordersIndex.xlEdgeBottom: "bottom",
+        Excel.BordersIndex.xlEdgeLeft: "left",
+        Excel.BordersIndex.xlEdgeRight: "right",
+        Excel.BordersIndex.xlEdgeTop: "top",
+        Excel.BordersIndex.xlInsideHorizontal: "bottom",
+        Excel.BordersIndex.xlInsideVertical: "right",
+    }
+    BorderStyles = {
+        (Excel.LineStyle.xlContinuous, Excel.BorderWeight.xlHairline): "hair",
+        (Excel.LineStyle.xlContinuous, Excel.BorderWeight.xlThin): "thin",
+        (Excel.LineStyle.xlContinuous, Excel.BorderWeight.xlMedium): "medium",
+        (Excel.LineStyle.xlContinuous, Excel.BorderWeight.xlThick): "thick",
+    }
+
+    def __init__(self):
+        self.book = None
+        self._fonts = {}
+
+    def _cells(self, rng: SheetRange) -> tuple:
+        """2-D tuple of cells in range"""
+        cells = self.book[rng.sheet][rng.address]
+        if not isinstance(cells, tuple):
+            return ((cells,),)
+        if not isinstance(cells[0], tuple):
+            return (cells,)
+        return cells
+
+    def open(self, path: str):
+        import openpyxl
+
+        self.book = openpyxl.load_workbook(path)
+
+    def add_sheet(self, name: str, after: str):
+        self.book.create_sheet(name, index=self.book.index(self.book[after]) + 1)
+
+    def get_last_row(self, sheet: str) -> int:
+        return self.book[sheet].max_row
+
+    def activate(self, sheet: str):
+        self.book.active = self.book[sheet]
+
+    def get_value(self, rng: SheetRange):
+        return self._cells(rng)[0][0].value
+
+    def set_value(self, rng: SheetRange, value):
+        for row in self._cells(rng):
+            for cell in row:
+                cell.value = value
+
+    def set_formula(self, rng: SheetRange, formula: str):
+        self.set_formulas(
+            rng,
+            [
+                [shift_formula(formula, row, col) for col in range(len(cells))]
+                for row, cells in enumerate(self._cells(rng))
+            ],
+        )
+
+    def set_values(self, rng: SheetRange, rows: list):
+        for cells, values in zip(self._cells(rng), rows):
+            for cell, value in zip(cells, values):
+                cell.value = value
+
+    def set_formulas(self, rng: SheetRange, rows: list):
+        ## Implicit intersection (@) is the default for formulas stored in a file
+        self.set_values(
+            rng, [[strip_implicit_intersection(x) for x in row] for row in rows]
+        )
+
+    def set_format(
+        self,
+        rng: SheetRange,
+        number_format: str = None,
+        font_size: int = None,
+        font_name: str = None,
+        bold: bool = False,
+        italic: bool = False,
+        underline: bool = False,
+    ):
+        ## Only cells in the used area of the sheet, rather than creating empty ones
+        min_row, max_row, min_col, max_col = self._get_bounds(rng)
+        font_changes = (font_size, font_name, bold, italic, underline)
+        for row in self.book[rng.sheet].iter_rows(
+            min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col
+        ):
+            for cell in row:
+                if number_format:
+                    cell.number_format = number_format
+                if any(font_changes):
+                    cell.font = self._get_font(cell, *font_changes)
+
+    def _get_font(
+        self,
+        cell,
+        font_size: int,
+        font_name: str,
+        bold: bool,
+        italic: bool,
+        underline: bool,
+    ):
+        """Copy of cell's font with changes applied, re-used for cells sharing a font"""
+        font_id = cell._style.fontId if cell.has_style else 0
+        key = (font_id, font_size, font_name, bold, italic, underline)
+        if key not in self._fonts:
+            new_font = copy(cell.font)
+            if font_size:
+                new_font.size = font_size
+            if font_name:
+                new_font.name = font_name
+            if bold:
+                new_font.bold = True
+            if italic:
+                new_font.italic = True
+            if underline:
+                new_font.underline = "single"
+            self._fonts[key] = new_font
+        return self._fonts[key]
+
+    def set_border(
+        self,
+        rng: SheetRange,
+        border_pos: int,
+        line_style: int,
+        border_weight: int,
+    ):
+        from openpyxl.styles import Side
+
+        side_name = self.BorderSides[border_pos]
+        if line_style == Excel.LineStyle.xlDouble:
+            side = Side(style="double")
+        else:
+            side = Side(style=self.BorderStyles[(line_style, border_weight)])
+
+        cells = self._cells(rng)
+        if border_pos == Excel.BordersIndex.xlInsideHorizontal:
+            edge = [cell for row in cells[:-1] for cell in row]
+        elif border_pos == Excel.BordersIndex.xlInsideVertical:
+            edge = [cell for row in cells for cell in row[:-1]]
+        elif side_name == "bottom":
+            edge = cells[-1]
+        elif side_name == "top":
+            edge = cells[0]
+        elif side_name == "left":
+            edge = [row[0] for row in cells]
+        else:
+            edge = [row[-1] for row in cells]
+        for cell in edge:
+            border = copy(cell.border)
+            setattr(border, side_name, side)
+            cell.border = border
+
+    def set_characters_font_size(
+        self, rng: SheetRange, start: int, stop: int, size: int
+    ):
+        from openpyxl.cell.rich_text import CellRichText, TextBlock
+        from openpyxl.cell.text import InlineFont
+
+        cell = self._cells(rng)[0][0]
+        text = str(cell.value)
+        font = InlineFont(rFont=cell.font.name, sz=cell.font.size, b=cell.font.bold)
+        blocks = [
+            TextBlock(InlineFont(rFont=font.rFont, sz=size, b=font.b), text[start:stop])
+        ]
+        if text[stop:]:
+            blocks.append(TextBlock(font, text[stop:]))
+        cell.value = CellRichText(*blocks)
+
+    def copy_range(self, src: SheetRange, dst: SheetRange):
+        ## Source is repeated to fill the destination, as when pasting in Excel
+        src_cells = self._cells(src)
+        for row, dst_row in enumerate(self._cells(dst)):
+            src_row = src_cells[row % len(src_cells)]
+            for col, dst_cell in enumerate(dst_row):
+                src_cell = src_row[col % len(src_row)]
+                dst_cell.value = src_cell.value
+                dst_cell._style = copy(src_cell._style)
+
+    def clear_contents(self, rng: SheetRange):
+        min_row, max_row, min_col, max_col = self._get_bounds(rng)
+        for row in self.book[rng.sheet].iter_rows(
+            min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col
+        ):
+            for cell in row:
+                cell.value = None
+
+    def _get_bounds(self, rng: SheetRange) -> tuple:
+        """min_row, max_row, min_col, max_col of range, limited to used area"""
+        from openpyxl.utils.cell import range_boundaries
+
+        ws = self.book[rng.sheet]
+        min_col, min_row, max_col, max_row = range_boundaries(rng.address)
+        return (
+            min_row,
+            min(max_row, ws.max_row),
+            min_col,
+            min(max_col, ws.max_column),
+        )
+
+    def write_frame(self, rng: SheetRange, df: pd.DataFrame):
+        from openpyxl.utils.cell import coordinate_to_tuple
+
+        ws = self.book[rng.sheet]
+        start_row, start_col = coordinate_to_tuple(rng.address.split(":")[0])
+        values = df.astype(object).where(df.notnull(), None)
+        for row_index, row in enumerate(values.itertuples(index=False)):
+            for col_index, value in enumerate(row):
+                ws.cell(start_row + row_index, start_col + col_index, value)
+
+    def set_zoom(self, sheet: str, zoom: int):
+        self.book[sheet].sheet_view.zoomScale = zoom
+
+    def save(self, path: str):
+        self.book.save(path)
+
+    def close(self):
+        self.book.close()
+
+
+class BatchWriter(BaseWriter):
+    """Records writes into a plan, sends them to another writer in bulk
+
+    Values, formulas, copies & styles are held in memory until `flush()`.
+    Adjacent cells are then written as 2-D value/formula arrays, and ranges
+    sharing a style are merged, so each style is applied in as few calls as
+    possible. Reading & Data sheet writes (already bulk) pass straight through.
+
+    Attributes
+    ----------
+        writer : BaseWriter
+            writer the plan is flushed to
+    """
+
+    ## Merging ranges vertically would drop bottom/top borders between rows,
+    ## and horizontally would drop left/right borders between columns
+    VerticalEdges = (Excel.BordersIndex.xlEdgeLeft, Excel.BordersIndex.xlEdgeRight)
+    HorizontalEdges = (Excel.BordersIndex.xlEdgeBottom, Excel.BordersIndex.xlEdgeTop)
+
+    def __init__(self, writer: BaseWriter):
+        self.writer = writer
+        self._reset()
+
+    def _reset(self):
+        """Clears the plan"""
+        self._values = {}
+        self._formulas = {}
+        self._copies = {}
+        self._styles = {}
+        self._borders = {}
+        self._characters = []
+        self._zooms = {}
+
+    def _cell_keys(self, rng: SheetRange):
+        """(sheet, row, col), row offset, col offset for each cell in range"""
+        min_row, min_col, max_row, max_col = get_range_bounds(rng.address)
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                yield (rng.sheet, row, col), row - min_row, col - min_col
+
+    def open(self, path: str):
+        self.writer.open(path)
+
+    def add_sheet(self, name: str, after: str):
+        self.writer.add_sheet(name, after)
+
+    def get_last_row(self, sheet: str) -> int:
+        return self.writer.get_last_row(sheet)
+
+    def activate(self, sheet: str):
+        self.writer.activate(sheet)
+
+    def get_value(self, rng: SheetRange):
+        key = next(self._cell_keys(rng))[0]
+        if key in self._values:
+            return self._values[key]
+        if key in self._formulas:
+            return self._formulas[key]
+        return self.writer.get_value(rng)
+
+    def set_value(self, rng: SheetRange, value):
+        for key, _, _ in self._cell_keys(rng):
+            self._formulas.pop(key, None)
+            self._values[key] = value
+
+    def set_formula(self, rng: SheetRange, formula: str):
+        for key, row, col in self._cell_keys(rng):
+            self._values.pop(key, None)
+            self._formulas[key] = shift_formula(formula, row, col)
+
+    def set_values(self, rng: SheetRange, rows: list):
+        for key, row, col in self._cell_keys(rng):
+            self._formulas.pop(key, None)
+            self._values[key] = rows[row][col]
+
+    def set_formulas(self, rng: SheetRange, rows: list):
+        for key, row, col in self._cell_keys(rng):
+            self._values.pop(key, None)
+            self._formulas[key] = rows[row][col]
+
+    def set_format(
+        self,
+        rng: SheetRange,
+        number_format: str = None,
+        font_size: int = None,
+        font_name: str = None,
+        bold: bool = False,
+        italic: bool = False,
+        underline: bool = False,
+    ):
+        style = (
+            rng.sheet,
+            number_format,
+            font_size,
+            font_name,
+            bold,
+            italic,
+            underline,
+        )
+        self._styles.setdefault(style, []).append(get_range_bounds(rng.address))
+
+    def set_border(
+        self,
+        rng: SheetRange,
+        border_pos: int,
+        line_style: int,
+        border_weight: int,
+    ):
+        style = (rng.sheet, border_pos, line_style, border_weight)
+        self._borders.setdefault(style, []).append(get_range_bounds(rng.address))
+
+    def set_characters_font_size(
+        self, rng: SheetRange, start: int, stop: int, size: int
+    ):
+        self._characters.append((rng, start, stop, size))
+
+    def copy_range(self, src: SheetRange, dst: SheetRange):
+        self._copies.setdefault((src, dst.sheet), []).append(
+            get_range_bounds(dst.address)
+        )
+
+    def clear_contents(self, rng: SheetRange):
+        self.writer.clear_contents(rng)
+
+    def write_frame(self, rng: SheetRange, df: pd.DataFrame):
+        self.writer.write_frame(rng, df)
+
+    def set_zoom(self, sheet: str, zoom: int):
+        self._zooms[sheet] = zoom
+
+    @staticmethod
+    def _merge_bounds(
+        bounds: list, vertical: bool = True, horizontal: bool = True
+    ) -> list:
+        """Merges adjacent or overlapping ranges into larger rectangles
+
+        Parameters
+        ----------
+            bounds : list
+                (min_row, min_col, max_row, max_col) of each range
+            vertical (bool, optional): bool, default True
+                merge ranges spanning the same columns in adjacent rows
+            horizontal (bool, optional): bool, default True
+                merge ranges spanning the same rows in adjacent columns
+
+        Returns
+        -------
+            list
+                (min_row, min_col, max_row, max_col) of merged ranges
+        """
+        merged = sorted(set(bounds))
+        if vertical:
+            runs = []
+            for b in sorted(merged, key=lambda x: (x[1], x[3], x[0])):
+                last = runs[-1] if runs else None
+                if last and (last[1], last[3]) == (b[1], b[3]) and b[0] <= last[2] + 1:
+                    runs[-1] = (last[0], last[1], max(last[2], b[2]), last[3])
+                else:
+                    runs.append(b)
+            merged = runs
+        if horizontal:
+            runs = []
+            for b in sorted(merged, key=lambda x: (x[0], x[2], x[1])):
+                last = runs[-1] if runs else None
+                if last and (last[0], last[2]) == (b[0], b[2]) and b[1] <= last[3] + 1:
+                    runs[-1] = (last[0], last[1], last[2], max(last[3], b[3]))
+                else:
+                    runs.append(b)
+            merged = runs
+        return merged
+
+    @staticmethod
+    def _get_blocks(cells: dict) -> list:
+        """Groups recorded cells into rectangular 2-D blocks
+
+        Parameters
+        ----------
+            cells : dict
+                (sheet, row, col) -> value
+
+        Returns
+        -------
+            list
+                (SheetRange, 2-D list of values) per block
+        """
+        ## Runs of adjacent cells within each row
+        runs = []
+        for sheet, row, col in sorted(cells):
+            last = runs[-1] if runs else None
+            if last and last[:2] == (sheet, row) and last[3] == col - 1:
+                runs[-1] = (sheet, row, last[2], col)
+            else:
+                runs.append((sheet, row, col, col))
+
+        ## Runs spanning the same columns in adjacent rows
+        blocks = []
+        for sheet, row, min_col, max_col in sorted(
+            runs, key=lambda x: (x[0], x[2], x[3], x[1])
+        ):
+            last = blocks[-1] if blocks else None
+            if last and last[0] == sheet and last[2:] == [min_col, max_col]:
+                if last[1][1] == row - 1:
+                    last[1] = (last[1][0], row)
+                    continue
+            blocks.append([sheet, (row, row), min_col, max_col])
+
+        return [
+            (
+                SheetRange(
+                    sheet, get_range_address(min_row, min_col, max_row, max_col)
+                ),
+                [
+                    [cells[(sheet, row, col)] for col in range(min_col, max_col + 1)]
+                    for row in range(min_row, max_row + 1)
+                ],
+            )
+            for sheet, (min_row, max_row), min_col, max_col in blocks
+        ]
+
+    def flush(self):
+        """Sends the plan to the writer in bulk, then clears it
+
+        Copies are sent first, then values, formulas, styles, borders and
+        partial-text fonts, so later steps are not overwritten by earlier ones.
+        """
+        for (src, sheet), bounds in self._copies.items():
+            for b in self._merge_bounds(bounds):
+                self.writer.copy_range(src, SheetRange(sheet, get_range_address(*b)))
+
+        for rng, rows in self._get_blocks(self._values):
+            self.writer.set_values(rng, rows)
+        for rng, rows in self._get_blocks(self._formulas):
+            self.writer.set_formulas(rng, rows)
+
+        for (sheet, *style), bounds in self._styles.items():
+            for b in self._merge_bounds(bounds):
+                self.writer.set_format(SheetRange(sheet, get_range_address(*b)), *style)
+
+        for (
+            sheet,
+            border_pos,
+            line_style,
+            border_weight,
+        ), bounds in self._borders.items():
+            merged = self._merge_bounds(
+                bounds,
+                vertical=border_pos not in self.HorizontalEdges,
+                horizontal=border_pos not in self.VerticalEdges,
+            )
+            for b in merged:
+                self.writer.set_border(
+                    SheetRange(sheet, get_range_address(*b)),
+                    border_pos,
+                    line_style,
+                    border_weight,
+                )
+
+        for rng, start, stop, size in self._characters:
+            self.writer.set_characters_font_size(rng, start, stop, size)
+        for sheet, zoom in self._zooms.items():
+            self.writer.set_zoom(sheet, zoom)
+
+        self._reset()
+
+    def save(self, path: str):
+        self.flush()
+        self.writer.save(path)
+
+    def close(self):
+        self.writer.close()
+
+
+Writers = {
+    Excel.Backends.Xlwings: XlwingsWriter,
+    Excel.Backends.Openpyxl: OpenpyxlWriter,
+}
+
+
+def get_writer(backend: Union[str, BaseWriter]) -> BaseWriter:
+    """Gets writer for backend name, see `Writers`
+
+    Parameters
+    ----------
+        backend : Union[str, BaseWriter]
+            name of backend, or writer instance (returned as-is)
+
+    Returns
+    -------
+        BaseWriter
+    """
+    if isinstance(backend, BaseWriter):
+        return backend
+    if backend not in Writers:
+        raise ValueError(
+            f"Unknown backend {backend}, expected one of {list(Writers.keys())}"
+        )
+    return Writers[backend]()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+## Modules import each other by name, as when run from personal_budget_tool/
+PACKAGE_DIR = os.path.join(os.path.dirname(__file__), "..", "personal_budget_tool")
+sys.path.insert(0, os.path.abspath(PACKAGE_DIR))
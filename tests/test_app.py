@@ -0,0 +1,68 @@
+import pytest
+
+import app
+import data
+
+
+class FakeDataBuilder:
+    """Records the DataBuilder arguments main() passes, builds nothing"""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        FakeDataBuilder.instances.append(self)
+
+    def build_data_model(self):
+        pass
+
+    def get_df(self):
+        return None
+
+    def export(self, path, data_format=None, partition_by_year=False):
+        return path
+
+
+def test_incremental_requires_cache_dir(capsys):
+    with pytest.raises(SystemExit):
+        app.parse_args(["--incremental"])
+    assert "--incremental requires --cache-dir" in capsys.readouterr().err
+
+
+def test_incremental_passed_to_data_builder(monkeypatch, tmp_path):
+    monkeypatch.setattr(data, "DataBuilder", FakeDataBuilder)
+    FakeDataBuilder.instances.clear()
+
+    app.main(
+        [
+            "--no-prompt",
+            "--data-only",
+            "--incremental",
+            "--cache-dir",
+            str(tmp_path / "cache"),
+            "--output-dir",
+            str(tmp_path),
+        ]
+    )
+
+    (builder,) = FakeDataBuilder.instances
+    assert builder.kwargs["incremental"] is True
+    assert builder.kwargs["cache_dir"] == str(tmp_path / "cache")
+
+
+def test_incremental_off_by_default():
+    assert app.parse_args([]).incremental is False
+
+
+def test_cash_balance_by_requires_cash_balance(capsys):
+    with pytest.raises(SystemExit):
+        app.parse_args(["--cash-balance-by", "display_group"])
+    assert "--cash-balance-by requires --cash-balance" in capsys.readouterr().err
+
+
+def test_cash_balance_by_rejects_opening_balance(capsys):
+    with pytest.raises(SystemExit):
+        app.parse_args(["--cash-balance", "500", "--cash-balance-by", "display_group"])
+    assert "use --cash-balance 0" in capsys.readouterr().err
+    args = app.parse_args(["--cash-balance", "0", "--cash-balance-by", "display_group"])
+    assert args.cash_balance_by == "display_group"
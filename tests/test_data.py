@@ -0,0 +1,267 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data
+from constants import Models
+from data import DataBuilder
+
+SEASONALITY = pd.DataFrame(
+    {
+        "month_number": range(1, 13),
+        "seasonality_multiplier": [1.00] * 6 + [1.50, 1.25] + [1.00] * 4,
+    }
+)
+
+
+def get_items(*items: dict) -> pd.DataFrame:
+    """Budget Items as read from Inputs, fields missing from items are blank"""
+    df = pd.DataFrame(
+        [
+            {
+                "is_active": True,
+                "is_seasonality": False,
+                "item_name": f"Item {i}",
+                "display_group": "Group",
+                "item_type": "Expense",
+                "item_amount": 10.00 * i,
+                **item,
+            }
+            for i, item in enumerate(items, 1)
+        ],
+        columns=Models.BudgetItem.Columns,
+    )
+    for col in ["frequency_date", "start_date", "end_date"]:
+        df[col] = pd.to_datetime(df[col])
+    df["frequency_day"] = df["frequency_day"].astype(np.float64)
+    df.insert(0, Models.BudgetItem.IndexColumn, df.index + 1)
+    return df
+
+
+def build(items: pd.DataFrame, min_date, max_date, **kwargs) -> DataBuilder:
+    builder = DataBuilder(
+        min_date, max_date, items=items, seasonality=SEASONALITY, **kwargs
+    )
+    builder.build_data_model()
+    return builder
+
+
+def baseline_amount(row: pd.Series) -> float:
+    """Row-wise frequency rules the vectorized engine has to match
+
+    Monthly frequency_day past the month end moves to the last day of the month.
+    Bi-Weekly steps 14 days from start_date.
+    """
+    date = row["date"]
+    if not row["is_active"]:
+        return 0.00
+    if pd.notnull(row["end_date"]) and date > row["end_date"]:
+        return 0.00
+    if pd.notnull(row["start_date"]) and date < row["start_date"]:
+        return 0.00
+
+    frequency_type = row["frequency_type"]
+    frequency_day = row["frequency_day"]
+    if frequency_type == "Daily":
+        hit = True
+    elif frequency_type == "Weekly":
+        hit = row["day_of_week"] == (1 if pd.isnull(frequency_day) else frequency_day)
+    elif frequency_type == "Bi-Weekly":
+        hit = (date - row["start_date"]).days % 14 == 0
+    elif frequency_type == "Monthly":
+        hit = pd.notnull(frequency_day) and row["day_number"] == min(
+            frequency_day, date.days_in_month
+        )
+    elif frequency_type in ["Annual", "One-Time"]:
+        hit = date == row["frequency_date"]
+    else:
+        hit = False
+
+    if not hit:
+        return 0.00
+    sign = 1.00 if row["item_type"] == "Income" else -1.00
+    multiplier = row["seasonality_multiplier"] if row["is_seasonality"] else 1.00
+    return row["item_amount"] * sign * multiplier
+
+
+def test_budget_amounts_match_row_wise_rules():
+    items = get_items(
+        {"frequency_type": "Daily", "is_seasonality": True},
+        {
+            "frequency_type": "Daily",
+            "start_date": "2026-02-10",
+            "end_date": "2026-03-05",
+        },
+        {"frequency_type": "Weekly", "frequency_day": 4, "item_type": "Income"},
+        {"frequency_type": "Weekly"},
+        {"frequency_type": "Bi-Weekly", "start_date": "2025-12-26"},
+        {"frequency_type": "Bi-Weekly", "start_date": "2026-03-03", "is_active": False},
+        {"frequency_type": "Monthly", "frequency_day": 15, "is_seasonality": True},
+        {"frequency_type": "Monthly", "frequency_day": 31},
+        {"frequency_type": "Monthly", "frequency_day": 30, "end_date": "2026-06-30"},
+        {"frequency_type": "Monthly"},
+        {"frequency_type": "Annual", "frequency_date": "2026-07-04"},
+        {"frequency_type": "Annual", "frequency_date": "2024-07-04"},
+        {"frequency_type": "One-Time", "frequency_date": "2026-02-28"},
+        {"frequency_type": "One-Time", "frequency_date": "2026-08-01", "is_active": 0},
+    )
+    builder = build(items, datetime(2026, 1, 1), datetime(2026, 12, 31))
+
+    df = builder.date_items
+    assert len(df) == 365 * len(items)
+    expected = df.apply(baseline_amount, axis=1)
+    np.testing.assert_allclose(df["budget_item_amount"], expected)
+    occurrences = (df["budget_item_amount"] != 0).groupby(df["budget_item_id"]).sum()
+    assert occurrences.tolist() == [365, 24, 52, 52, 26, 0, 12, 12, 6, 0, 1, 0, 1, 0]
+
+
+def get_builder() -> DataBuilder:
+    """DataBuilder over 3 days & 2 display groups, without reading Inputs"""
+    builder = DataBuilder.__new__(DataBuilder)
+    builder.dates = pd.DataFrame(
+        {"date_id": [1, 2, 3], "date": pd.date_range(datetime(2026, 1, 1), periods=3)}
+    )
+    builder.date_items = pd.DataFrame(
+        {
+            "date_id": [1, 2, 3],
+            "display_group": ["Income", "Housing", "Housing"],
+            "budget_item_amount": [100.00, -40.00, -10.00],
+        }
+    )
+    return builder
+
+
+def test_cash_balance_by_group_opening_balances():
+    df = get_builder().get_cash_balance({"Income": 50.00}, by="display_group")
+
+    balances = df.groupby("display_group")["balance"].last()
+    assert balances["Income"] == 150.00
+    assert balances["Housing"] == -50.00
+
+
+def test_cash_balance_by_rejects_scalar_opening_balance():
+    builder = get_builder()
+    with pytest.raises(ValueError, match="dict of display_group"):
+        builder.get_cash_balance(500.00, by="display_group")
+    df = builder.get_cash_balance(0.00, by="display_group")
+    assert df["balance"].iloc[-2:].tolist() == [-50.00, 100.00]
+
+
+def test_cash_balance_overall():
+    df = get_builder().get_cash_balance(500.00)
+
+    assert df["balance"].tolist() == [600.00, 560.00, 550.00]
+    assert df["is_min_balance"].tolist() == [False, False, True]
+
+
+def every_n(unit: str, n: int, start_date: str) -> dict:
+    return {
+        "frequency_type": f"Every N {unit}",
+        "frequency_day": n,
+        "start_date": start_date,
+    }
+
+
+def get_schedule_items() -> pd.DataFrame:
+    """One item of each frequency_type, a few with start & end dates"""
+    return get_items(
+        {"frequency_type": "Daily", "start_date": "2026-11-20", "is_seasonality": True},
+        {"frequency_type": "Weekly", "frequency_day": 6, "end_date": "2026-03-01"},
+        {"frequency_type": "Bi-Weekly", "start_date": "2025-12-19"},
+        {"frequency_type": "Monthly", "frequency_day": 31, "item_type": "Income"},
+        {"frequency_type": "Monthly", "frequency_day": 20},
+        {"frequency_type": "Annual", "frequency_date": "2026-12-24"},
+        {"frequency_type": "One-Time", "frequency_date": "2027-01-02"},
+        every_n("Days", 10, "2026-01-03"),
+        every_n("Weeks", 3, "2025-06-02"),
+        every_n("Months", 2, "2026-01-31"),
+    )
+
+
+def get_occurrences(builder: DataBuilder) -> pd.DataFrame:
+    df = builder.date_items
+    return df[df["budget_item_amount"] != 0].reset_index(drop=True)
+
+
+def test_sparse_matches_dense_occurrences():
+    items = get_schedule_items()
+    min_date, max_date = datetime(2026, 1, 1), datetime(2027, 3, 31)
+
+    dense = build(items, min_date, max_date)
+    sparse = build(items, min_date, max_date, sparse=True)
+
+    assert len(sparse.date_items) < len(dense.date_items)
+    pd.testing.assert_frame_equal(sparse.date_items, get_occurrences(dense))
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_month_end_of_partial_month(sparse):
+    items = get_items(
+        {"frequency_type": "Monthly", "frequency_day": 20},
+        {"frequency_type": "Monthly", "frequency_day": 31},
+    )
+    builder = build(items, datetime(2025, 1, 25), datetime(2025, 3, 15), sparse=sparse)
+
+    df = get_occurrences(builder)
+    dates = df.groupby("budget_item_id")["date"].apply(list)
+    assert dates[1] == [pd.Timestamp(2025, 2, 20)]
+    assert dates[2] == [pd.Timestamp(2025, 1, 31), pd.Timestamp(2025, 2, 28)]
+
+
+def test_incremental_build_discarded_on_new_build_version(monkeypatch, tmp_path):
+    items = get_items({"frequency_type": "Monthly", "frequency_day": 1})
+    dates = datetime(2026, 1, 1), datetime(2026, 3, 31)
+    first = build(items, *dates, sparse=True, incremental=True, cache_dir=tmp_path)
+    ## Stands in for a build stored under older frequency rules
+    stored = pd.read_pickle(first._get_build_path())
+    stored["date_items"]["budget_item_amount"] = -99.00
+    pd.to_pickle(stored, first._get_build_path())
+
+    reused = build(items, *dates, sparse=True, incremental=True, cache_dir=tmp_path)
+    assert (reused.date_items["budget_item_amount"] == -99.00).all()
+
+    monkeypatch.setattr(data, "BUILD_VERSION", data.BUILD_VERSION + 1)
+    rebuilt = build(items, *dates, sparse=True, incremental=True, cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(rebuilt.date_items, first.date_items)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_stepped_schedules_across_year_end(sparse):
+    min_date, max_date = datetime(2025, 11, 1), datetime(2027, 2, 28)
+    items = get_items(
+        {"frequency_type": "Bi-Weekly", "start_date": "2025-12-19"},
+        every_n("Days", 10, "2025-12-28"),
+        every_n("Weeks", 3, "2025-06-02"),
+        every_n("Months", 2, "2026-01-31"),
+        every_n("Months", 3, "2025-08-31"),
+    )
+    builder = build(items, min_date, max_date, sparse=sparse)
+
+    def steps(start: str, unit: str, n: int) -> list:
+        """Every n units from start, in the calendar"""
+        start = pd.Timestamp(start)
+        dates = [start + pd.DateOffset(**{unit: n * i}) for i in range(120)]
+        return [x for x in dates if min_date <= x <= max_date]
+
+    dates = get_occurrences(builder).groupby("budget_item_id")["date"].apply(list)
+    assert dates[1] == steps("2025-12-19", "days", 14)
+    assert dates[2] == steps("2025-12-28", "days", 10)
+    assert dates[3] == steps("2025-06-02", "weeks", 3)
+    assert dates[4] == steps("2026-01-31", "months", 2)
+    assert dates[5] == steps("2025-08-31", "months", 3)
+    ## Month steps keep the 31st, moved to the last day of shorter months
+    month_ends = pd.to_datetime(["2025-11-30", "2026-02-28", "2026-05-31"])
+    assert dates[5][:3] == list(month_ends)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_parallel_build_matches_serial(sparse):
+    items = get_schedule_items()
+    min_date, max_date = datetime(2026, 1, 1), datetime(2027, 3, 31)
+
+    serial = build(items, min_date, max_date, sparse=sparse)
+    parallel = build(items, min_date, max_date, sparse=sparse, workers=2)
+
+    pd.testing.assert_frame_equal(parallel.date_items, serial.date_items)
@@ -0,0 +1,133 @@
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import excel
+from constants import Excel, Models
+from data import DataBuilder
+from excel import BudgetApp
+
+
+def get_detail(amount: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "item_name": ["Paycheck", "Rent", "Rent"],
+            "display_group": ["Income", "Home & Utilities", "Home & Utilities"],
+            "month_number": [1, 1, 2],
+            "year": [2026, 2026, 2026],
+            "budget_item_amount": [amount, -1200.00, -1200.00],
+        }
+    )
+
+
+def get_app(df: pd.DataFrame, cache_dir) -> BudgetApp:
+    return BudgetApp(
+        datetime(2026, 1, 1),
+        datetime(2026, 2, 28),
+        df,
+        backend="openpyxl",
+        cache_dir=str(cache_dir),
+    )
+
+
+def test_summary_cache_keeps_entries_of_other_budgets(monkeypatch, tmp_path):
+    monkeypatch.setattr(excel, "SUMMARY_CACHE_ENTRIES", 2)
+    ## Last used 2 hours & 1 hour ago
+    for hours, amount in [(2, 3000.00), (1, 3100.00)]:
+        before = set(tmp_path.glob("summary-*.pkl"))
+        get_app(get_detail(amount), tmp_path)._get_summary_tables()
+        (path,) = set(tmp_path.glob("summary-*.pkl")) - before
+        os.utime(path, (time.time() - hours * 3600,) * 2)
+    assert len(list(tmp_path.glob("summary-*.pkl"))) == 2
+
+    ## A hit marks the first budget as recently used, the second is evicted
+    first = get_app(get_detail(3000.00), tmp_path)
+    monkeypatch.setattr(first, "_aggregate_summary", None)
+    assert first._get_unique_months() == [(1, 2026)]
+    get_app(get_detail(3200.00), tmp_path)._get_summary_tables()
+
+    cached = get_app(get_detail(3000.00), tmp_path)
+    monkeypatch.setattr(cached, "_aggregate_summary", None)
+    cached._get_summary_tables()
+    assert len(list(tmp_path.glob("summary-*.pkl"))) == 2
+
+
+def test_summary_tables_match_the_detail(tmp_path):
+    tables = get_app(get_detail(3000.00), tmp_path)._get_summary_tables()
+
+    assert tables["month_years"] == [(1, 2026)]
+    assert tables["items"]["item_name"].tolist() == ["Paycheck", "Rent"]
+    assert tables["item_totals"].loc["Rent", (2, 2026)] == -1200.00
+
+
+def get_cells(path) -> dict:
+    """Value & style of every cell of a workbook, keyed on sheet & coordinate"""
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.load_workbook(path)
+    return {
+        (ws.title, cell.coordinate): (
+            cell.value,
+            cell.number_format,
+            repr(cell.font),
+            repr(cell.fill),
+            repr(cell.border),
+            repr(cell.alignment),
+        )
+        for ws in workbook.worksheets
+        for row in ws.iter_rows()
+        for cell in row
+    }
+
+
+def get_template(tmp_path) -> str:
+    """Bare template workbook, the Summary title & the Data sheet header"""
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    workbook.active.title = excel.TEMPLATE_SHEET
+    workbook.active["B2"] = "Budget MinDate - MaxDate"
+    workbook.create_sheet(excel.DATA_SHEET).append(Models.ExportData.Columns)
+    path = str(tmp_path / "Template.xlsx")
+    workbook.save(path)
+    return path
+
+
+@pytest.mark.parametrize("summary_mode", list(Excel.SummaryMode.values()))
+def test_batched_workbook_matches_unbatched(summary_mode, tmp_path):
+    template_path = get_template(tmp_path)
+    min_date, max_date = datetime(2026, 1, 1), datetime(2026, 3, 31)
+    builder = DataBuilder(min_date, max_date, sparse=True)
+    builder.build_data_model()
+
+    cells = []
+    for batch in [True, False]:
+        app = BudgetApp(
+            min_date,
+            max_date,
+            builder.get_df(),
+            backend="openpyxl",
+            batch=batch,
+            summary_mode=summary_mode,
+            template_path=template_path,
+            save_path=str(tmp_path / str(batch)),
+        )
+        app.build()
+        app.save_and_close()
+        (path,) = (tmp_path / str(batch)).iterdir()
+        cells.append(get_cells(path))
+
+    assert len(cells[0]) > 0
+    assert cells[0] == cells[1]
+
+
+def test_unknown_data_overflow_is_rejected():
+    with pytest.raises(ValueError, match="Unknown data_overflow csv"):
+        BudgetApp(
+            datetime(2026, 1, 1),
+            datetime(2026, 2, 28),
+            get_detail(3000.00),
+            backend="openpyxl",
+            data_overflow="csv",
+        )
@@ -0,0 +1,115 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+import kernels
+
+CODES = [
+    kernels.UNKNOWN,
+    kernels.DAILY,
+    kernels.WEEKLY,
+    kernels.MONTHLY,
+    kernels.DATED,
+    kernels.STRIDE_DAYS,
+    kernels.STRIDE_MONTHS,
+]
+
+
+def get_calendar() -> dict:
+    """Calendar arrays from mid-December to mid-March, partial months at both ends"""
+    date = pd.Series(pd.date_range("2025-12-15", "2026-03-15"))
+    return {
+        "ordinal": (date - pd.Timestamp(1970, 1, 1)).dt.days.to_numpy(np.int64),
+        "day_of_week": ((date.dt.dayofweek + 1) % 7 + 1).to_numpy(np.int64),
+        "day_number": date.dt.day.to_numpy(np.int64),
+        "month_index": (date.dt.year * 12 + date.dt.month - 1).to_numpy(np.int64),
+        "last_day": date.dt.days_in_month.to_numpy(np.int64),
+        "seasonality": np.where(date.dt.month == 1, 1.5, 1.0),
+    }
+
+
+def get_items(calendar: dict) -> dict:
+    """Item arrays of every code, with & without start/end, step 0 & day missing"""
+    first, last = calendar["ordinal"][[0, -1]]
+    starts = [kernels.MISSING, first - 40, first + 10]
+    ends = [kernels.MISSING, last - 20]
+    combos = list(
+        itertools.product(CODES, starts, ends, [0, 1, 3], [np.nan, 4.0, 31.0])
+    )
+    code, start, end, step, day = (np.array(x) for x in zip(*combos))
+    start_date = pd.to_datetime(
+        np.where(start == kernels.MISSING, first, start), unit="D"
+    )
+    n_items = len(combos)
+    return {
+        "is_active": np.arange(n_items) % 7 != 0,
+        "code": code.astype(np.int64),
+        "step": step.astype(np.int64),
+        "day": day.astype(np.float64),
+        "date_ordinal": np.where(
+            np.arange(n_items) % 2, first + 30, kernels.MISSING
+        ).astype(np.int64),
+        "start_ordinal": start.astype(np.int64),
+        "end_ordinal": end.astype(np.int64),
+        "start_month_index": (start_date.year * 12 + start_date.month - 1).to_numpy(
+            np.int64
+        ),
+        "start_day": np.where(step == 3, 31, start_date.day).astype(np.int64),
+        "amount": np.linspace(-100.0, 100.0, n_items),
+        "is_seasonality": np.arange(n_items) % 3 == 0,
+    }
+
+
+def run(kernel, item_pos, date_pos, calendar, items):
+    amounts = np.zeros(len(item_pos), dtype=np.float64)
+    occurs = np.zeros(len(item_pos), dtype=np.bool_)
+    kernel(
+        item_pos,
+        date_pos,
+        *[calendar[name] for name in kernels.CALENDAR_ARRAYS],
+        *[items[name] for name in kernels.ITEM_ARRAYS],
+        amounts,
+        occurs,
+    )
+    return amounts, occurs
+
+
+def test_numpy_kernel_matches_loop():
+    calendar = get_calendar()
+    items = get_items(calendar)
+    item_pos, date_pos = (
+        x.ravel().astype(np.int64)
+        for x in np.meshgrid(
+            np.arange(len(items["code"])), np.arange(len(calendar["ordinal"]))
+        )
+    )
+
+    loop = run(kernels._budget_amounts_loop, item_pos, date_pos, calendar, items)
+    vectorized = run(kernels._budget_amounts_numpy, item_pos, date_pos, calendar, items)
+
+    np.testing.assert_array_equal(vectorized[1], loop[1])
+    np.testing.assert_allclose(vectorized[0], loop[0])
+    ## Every code occurs somewhere, other than UNKNOWN
+    codes = items["code"][item_pos]
+    assert set(codes[loop[1]]) == set(CODES) - {kernels.UNKNOWN}
+
+
+def test_month_end_of_partial_month():
+    calendar = get_calendar()
+    items = {
+        **{name: np.zeros(1, dtype=np.int64) for name in kernels.ITEM_ARRAYS},
+        "is_active": np.array([True]),
+        "code": np.array([kernels.MONTHLY]),
+        "day": np.array([20.0]),
+        "start_ordinal": np.array([kernels.MISSING]),
+        "end_ordinal": np.array([kernels.MISSING]),
+        "amount": np.array([1.0]),
+        "is_seasonality": np.array([False]),
+    }
+    date_pos = np.arange(len(calendar["ordinal"]), dtype=np.int64)
+    item_pos = np.zeros(len(date_pos), dtype=np.int64)
+
+    for kernel in [kernels._budget_amounts_loop, kernels._budget_amounts_numpy]:
+        _, occurs = run(kernel, item_pos, date_pos, calendar, items)
+        assert calendar["day_number"][occurs].tolist() == [20, 20, 20]
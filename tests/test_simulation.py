@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from simulation import simulate_budget
+
+## Multipliers of each distribution have a mean of 1.00
+VARIABILITY = [
+    {"where": {"display_group": "Food & Dining"}, "distribution": "normal", "std": 0.1},
+    {"where": {"item_name": "Electric"}, "distribution": "lognormal", "sigma": 0.25},
+    {
+        "where": {"item_name": "Dining Out"},
+        "distribution": "uniform",
+        "low": 0.70,
+        "high": 1.30,
+    },
+]
+
+
+def get_detail() -> pd.DataFrame:
+    """Budget detail over 3 months, a fixed & 3 variable items"""
+    dates = pd.Series(pd.date_range("2026-01-01", "2026-03-31"))
+    rows = [
+        ("Paycheck", "Income", dates.dt.day == 15, 2500.00),
+        ("Rent", "Home & Utilities", dates.dt.day == 1, -1200.00),
+        ("Electric", "Home & Utilities", dates.dt.day == 20, -90.00),
+        ("Groceries", "Food & Dining", dates.dt.dayofweek == 5, -110.00),
+        ("Dining Out", "Food & Dining", dates.dt.dayofweek == 4, -40.00),
+    ]
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "date_id": dates.index[is_date] + 1,
+                    "month_number": dates.dt.month[is_date],
+                    "year": dates.dt.year[is_date],
+                    "item_name": item_name,
+                    "display_group": display_group,
+                    "budget_item_amount": amount,
+                }
+            )
+            for item_name, display_group, is_date, amount in rows
+        ],
+        ignore_index=True,
+    )
+
+
+def test_simulation_shape():
+    df = get_detail()
+    results = simulate_budget(df, VARIABILITY, n_paths=500, opening_balance=100.00)
+
+    monthly = results["monthly"]
+    assert monthly.index.tolist() == [(1, 2026), (2, 2026), (3, 2026)]
+    assert monthly.columns.tolist() == [
+        "budget",
+        "mean",
+        "p5",
+        "p25",
+        "p50",
+        "p75",
+        "p95",
+    ]
+    assert (monthly["p5"] <= monthly["p50"]).all()
+    assert (monthly["p50"] <= monthly["p95"]).all()
+    assert results["ending_balance"]["budget"] == pytest.approx(
+        100.00 + df["budget_item_amount"].sum()
+    )
+
+
+def test_simulation_mean_converges_to_budget():
+    df = get_detail()
+    first = simulate_budget(df, VARIABILITY, n_paths=20000, seed=7)
+    second = simulate_budget(df, VARIABILITY, n_paths=20000, seed=7)
+
+    pd.testing.assert_frame_equal(first["monthly"], second["monthly"])
+    monthly = first["monthly"]
+    np.testing.assert_allclose(monthly["mean"], monthly["budget"], atol=5.00)
+    ## Variable items spread the paths around the budget
+    assert (monthly["p95"] - monthly["p5"] > 50.00).all()
+    balance = first["ending_balance"]
+    assert balance["mean"] == pytest.approx(balance["budget"], abs=10.00)
+
+
+def test_simulation_without_variability_is_the_budget():
+    results = simulate_budget(get_detail(), [], n_paths=10, seed=0)
+
+    monthly = results["monthly"]
+    for col in ["mean", "p5", "p95"]:
+        np.testing.assert_allclose(monthly[col], monthly["budget"])
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from utils import (
+    _get_input_cache_path,
+    _read_input_cache,
+    _write_input_cache,
+    strip_implicit_intersection,
+)
+
+
+def test_input_cache_round_trip_mixed_and_missing(tmp_path):
+    df = pd.DataFrame(
+        {
+            "budget_item_id": [1, 2, 3],
+            "item_name": ["Rent", np.nan, "Gym"],
+            "frequency_day": [1.0, np.nan, 15.0],
+            "notes": pd.Series([12, "text", np.nan], dtype=object),
+            "start_date": pd.to_datetime(["2024-01-01", None, "2024-03-01"]),
+            "is_active": [True, False, True],
+        }
+    )
+    cache_path = str(tmp_path / "Budget_Items-0123456789abcdef")
+
+    _write_input_cache(cache_path, df)
+    cached = _read_input_cache(cache_path)
+
+    pd.testing.assert_frame_equal(cached, df)
+    ## Missing values come back as NaN, as read_excel gives them, not None
+    assert cached.at[2, "notes"] is not None and np.isnan(cached.at[2, "notes"])
+
+
+def test_input_cache_replaces_stale_entries(tmp_path):
+    df = pd.DataFrame({"budget_item_id": [1, 2], "item_amount": [10.0, 20.0]})
+    _write_input_cache(str(tmp_path / "Budget_Items-aaaaaaaaaaaaaaaa"), df)
+    _write_input_cache(str(tmp_path / "Budget_Items-bbbbbbbbbbbbbbbb"), df)
+
+    assert _read_input_cache(str(tmp_path / "Budget_Items-aaaaaaaaaaaaaaaa")) is None
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_input_cache_keeps_entries_of_other_workbooks(tmp_path):
+    df = pd.DataFrame({"budget_item_id": [1, 2], "item_amount": [10.0, 20.0]})
+    source = {"sheet_name": "Budget Items", "header": 1}
+    cache_paths = []
+    for name in ["Inputs.xlsx", "Other Inputs.xlsx"]:
+        workbook = tmp_path / name
+        workbook.write_bytes(b"same contents")
+        cache_path = _get_input_cache_path(
+            str(tmp_path / "cache"), {**source, "io": str(workbook)}, {}
+        )
+        _write_input_cache(cache_path, df)
+        cache_paths.append(cache_path)
+
+    assert cache_paths[0] != cache_paths[1]
+    for cache_path in cache_paths:
+        pd.testing.assert_frame_equal(_read_input_cache(cache_path), df)
+
+
+def test_strip_implicit_intersection_only_removes_the_operator():
+    formula = (
+        "=IF(@$B:$B=\"a@b.com\",SUMIFS(Data!$T:$T,Data!$K:$K,@$B:$B),"
+        "@INDEX('Q@1'!A:A,1)+SUM(Table1[@Amount]))"
+    )
+    assert strip_implicit_intersection(formula) == (
+        "=IF($B:$B=\"a@b.com\",SUMIFS(Data!$T:$T,Data!$K:$K,$B:$B),"
+        "INDEX('Q@1'!A:A,1)+SUM(Table1[@Amount]))"
+    )
@@ -0,0 +1,20 @@
+import pytest
+
+from writers import BaseWriter, BatchWriter, OpenpyxlWriter, XlwingsWriter
+
+
+class PartialWriter(BaseWriter):
+    """Backend missing every method but open()"""
+
+    def open(self, path: str):
+        pass
+
+
+def test_backend_missing_methods_fails_on_creation():
+    with pytest.raises(TypeError, match="abstract"):
+        PartialWriter()
+
+
+def test_backends_implement_the_interface():
+    BatchWriter(OpenpyxlWriter())
+    BatchWriter(XlwingsWriter())